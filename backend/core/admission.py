@@ -0,0 +1,152 @@
+# backend/core/admission.py
+"""
+Admission control for runner execution.
+
+Each model family has a gate: at most `limit` runners execute at once, up to
+`max_queue` more wait in FIFO order for at most `timeout` seconds, and anything
+beyond that is rejected immediately with a Retry-After hint.
+"""
+from __future__ import annotations
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator
+
+
+class AdmissionRejected(RuntimeError):
+    """Queue full or wait timed out; `retry_after` is a whole number of seconds."""
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class FamilyGate:
+    def __init__(self, family: str, limit: int, max_queue: int, timeout: float):
+        self.family = family
+        self.limit = max(1, int(limit))
+        self.max_queue = max(0, int(max_queue))
+        self.timeout = float(timeout)
+        self._lock = threading.Lock()
+        self._waiters: Deque[threading.Event] = deque()
+        self.active = 0
+        self._hold_ema_s: float | None = None
+        self._counts = {"admitted": 0, "queued_total": 0, "rejected_full": 0, "rejected_timeout": 0}
+        self._wait_ms_total = 0.0
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free for a new arrival, from the mean slot hold time."""
+        hold = self._hold_ema_s if self._hold_ema_s is not None else 5.0
+        return max(1, math.ceil(hold * (len(self._waiters) + 1) / self.limit))
+
+    def _full(self) -> bool:
+        return self.active >= self.limit and len(self._waiters) >= self.max_queue
+
+    def check(self) -> None:
+        """Fail fast (no waiting) when a new request could not even queue."""
+        with self._lock:
+            if self._full():
+                self._counts["rejected_full"] += 1
+                raise AdmissionRejected(self._full_message(), self.retry_after())
+
+    def _full_message(self) -> str:
+        return (f"{self.family} capacity exhausted: {self.active} running, "
+                f"{len(self._waiters)} queued (limits {self.limit} / {self.max_queue})")
+
+    def acquire(self) -> Dict[str, Any]:
+        t0 = time.perf_counter()
+        with self._lock:
+            depth = len(self._waiters)
+            if self.active < self.limit and not self._waiters:
+                self.active += 1
+                ev = None
+            elif depth >= self.max_queue:
+                self._counts["rejected_full"] += 1
+                raise AdmissionRejected(self._full_message(), self.retry_after())
+            else:
+                ev = threading.Event()
+                self._waiters.append(ev)
+                self._counts["queued_total"] += 1
+        if ev is not None and not ev.wait(self.timeout):
+            with self._lock:
+                if not ev.is_set():  # a release may have handed us the slot just after the timeout
+                    self._waiters.remove(ev)
+                    self._counts["rejected_timeout"] += 1
+                    raise AdmissionRejected(
+                        f"timed out after {self.timeout:g}s waiting for a {self.family} slot",
+                        self.retry_after())
+        wait_ms = (time.perf_counter() - t0) * 1000.0
+        with self._lock:
+            self._counts["admitted"] += 1
+            self._wait_ms_total += wait_ms
+        return {"family": self.family, "wait_ms": wait_ms, "queue_depth": depth, "limit": self.limit}
+
+    def release(self, held_s: float) -> None:
+        with self._lock:
+            self._hold_ema_s = held_s if self._hold_ema_s is None else 0.8 * self._hold_ema_s + 0.2 * held_s
+            if self._waiters:
+                self._waiters.popleft().set()  # hand the slot straight to the next waiter
+            else:
+                self.active -= 1
+
+    @contextmanager
+    def slot(self) -> Iterator[Dict[str, Any]]:
+        ticket = self.acquire()
+        t = time.perf_counter()
+        try:
+            yield ticket
+        finally:
+            self.release(time.perf_counter() - t)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            admitted = self._counts["admitted"]
+            return {
+                "limit": self.limit, "max_queue": self.max_queue, "timeout_s": self.timeout,
+                "active": self.active, "queued": len(self._waiters),
+                "mean_wait_ms": self._wait_ms_total / admitted if admitted else 0.0,
+                "mean_hold_s": self._hold_ema_s,
+            } | self._counts
+
+
+class Admission:
+    def __init__(self, gates: Dict[str, FamilyGate]):
+        self.gates = gates
+
+    @classmethod
+    def from_env(cls) -> "Admission":
+        """
+        QML_MAX_CONCURRENT_{CLASSICAL,QUANTUM}: runners executing at once per family.
+        QML_MAX_QUEUE_{CLASSICAL,QUANTUM}: runners allowed to wait; QML_QUEUE_TIMEOUT: seconds.
+        """
+        cpus = os.cpu_count() or 2
+        timeout = float(os.environ.get("QML_QUEUE_TIMEOUT", 30))
+        env = os.environ.get
+        return cls({
+            "classical": FamilyGate("classical", int(env("QML_MAX_CONCURRENT_CLASSICAL", max(2, cpus))),
+                                    int(env("QML_MAX_QUEUE_CLASSICAL", 16)), timeout),
+            "quantum": FamilyGate("quantum", int(env("QML_MAX_CONCURRENT_QUANTUM", max(1, min(2, cpus // 2)))),
+                                  int(env("QML_MAX_QUEUE_QUANTUM", 8)), timeout),
+        })
+
+    def check(self, families: Iterable[str]) -> None:
+        for f in families:
+            self.gates[f].check()
+
+    def threads_needed(self) -> int:
+        """Threads that can be blocked in runners or in a gate queue at once."""
+        return sum(g.limit + g.max_queue for g in self.gates.values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {f: g.stats() for f, g in self.gates.items()}
+
+
+def admitted(admission: Admission, family: str, runner: Callable) -> Callable:
+    """Wrap a registry Runner so it only executes inside its family's slot."""
+    def _run(Xtr, ytr, Xte, params, classes):
+        with admission.gates[family].slot() as ticket:
+            proba, timings, extras = runner(Xtr, ytr, Xte, params, classes)
+        return proba, timings, dict(extras or {}) | {"admission": ticket}
+    return _run
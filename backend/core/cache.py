@@ -0,0 +1,78 @@
+# backend/core/cache.py
+from __future__ import annotations
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+import numpy as np
+
+
+def array_fingerprint(*arrays: np.ndarray) -> str:
+    """Content hash of one or more arrays (shape + dtype + bytes), usable as a cache key."""
+    h = hashlib.blake2b(digest_size=16)
+    for a in arrays:
+        a = np.ascontiguousarray(a)
+        h.update(str((a.shape, a.dtype.str)).encode())
+        h.update(memoryview(a).cast("B"))
+    return h.hexdigest()
+
+
+class LRUCache:
+    """
+    Small thread-safe LRU map; values are computed outside the lock.
+    With `max_bytes`, entries are also evicted until the summed `sizeof(value)` fits, and a
+    value larger than `max_bytes` on its own is not stored at all.
+    """
+    def __init__(self, maxsize: int = 32, max_bytes: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = lambda v: int(getattr(v, "nbytes", 0))):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: dict = {}
+        self.nbytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            self._drop(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = value
+            self._sizes[key] = size
+            self.nbytes += size
+            while len(self._data) > self.maxsize or (self.max_bytes is not None and self.nbytes > self.max_bytes):
+                self._drop(next(iter(self._data)))
+
+    def _drop(self, key: Hashable) -> None:
+        if key in self._data:
+            del self._data[key]
+            self.nbytes -= self._sizes.pop(key)
+
+    def values(self) -> list:
+        """Snapshot of the stored values (does not touch recency)."""
+        with self._lock:
+            return list(self._data.values())
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Return (value, hit). Concurrent misses may both compute; the last write wins."""
+        sentinel = object()
+        val = self.get(key, sentinel)
+        if val is not sentinel:
+            return val, True
+        val = factory()
+        self.put(key, val)
+        return val, False
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
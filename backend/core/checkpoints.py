@@ -0,0 +1,101 @@
+# backend/core/checkpoints.py
+from __future__ import annotations
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from core.cache import LRUCache, array_fingerprint
+from core.runstore import canonical_json
+
+# Bounded, process-local store of trained weights (+ optimizer state) so a
+# rerun with more epochs continues instead of starting over.
+_STORE = LRUCache(maxsize=int(os.environ.get("QML_CHECKPOINTS_MAX", 64)))
+
+
+@dataclass
+class Checkpoint:
+    ckpt_id: str
+    config_key: str
+    epochs: int
+    state: Any
+
+
+def _latest(key: str) -> Optional[str]:
+    """Id of the stored checkpoint of this configuration with the most epochs (None once all are evicted)."""
+    best = max((c for c in _STORE.values() if c.config_key == key), key=lambda c: c.epochs, default=None)
+    return best.ckpt_id if best else None
+
+
+@dataclass
+class ResumePlan:
+    config_key: str
+    epochs_total: int
+    epochs_reused: int = 0
+    state: Any = None
+    note: Optional[str] = None
+    save: bool = True
+
+    @property
+    def epochs_to_train(self) -> int:
+        return self.epochs_total - self.epochs_reused
+
+
+def config_key(runner: str, Xtr: np.ndarray, ytr: np.ndarray, config: Dict[str, Any]) -> str:
+    """Identity of a training setup: runner, exact training split, and every setting except epochs."""
+    h = hashlib.blake2b(digest_size=12)
+    h.update(runner.encode())
+    h.update(array_fingerprint(Xtr, ytr).encode())
+    h.update(canonical_json(config).encode())
+    return h.hexdigest()
+
+
+def plan_resume(runner: str, Xtr, ytr, config: Dict[str, Any], epochs: int, params: Dict[str, Any]) -> ResumePlan:
+    """
+    Decide how many epochs can be reused.
+    params["resume_from"]: a checkpoint_id from an earlier response, or "auto" for the
+    furthest-trained checkpoint of this exact configuration. params["checkpoint"]=False
+    skips saving.
+    """
+    plan = ResumePlan(config_key(runner, Xtr, ytr, config), int(epochs),
+                      save=params.get("checkpoint", True) not in (False, 0, "false", "False", "0"))
+    ref = params.get("resume_from")
+    if not ref:
+        return plan
+    if ref == "auto":
+        ref = _latest(plan.config_key)
+        if ref is None:
+            plan.note = "no checkpoint for this configuration"
+            return plan
+    ckpt: Optional[Checkpoint] = _STORE.get(str(ref))
+    if ckpt is None:
+        plan.note = f"checkpoint '{ref}' not found (evicted or from another process)"
+    elif ckpt.config_key != plan.config_key:
+        plan.note = f"checkpoint '{ref}' was trained with a different dataset or settings"
+    elif ckpt.epochs > plan.epochs_total:
+        plan.note = f"checkpoint '{ref}' already has {ckpt.epochs} epochs (> {plan.epochs_total} requested)"
+    else:
+        plan.epochs_reused = ckpt.epochs
+        plan.state = ckpt.state
+    return plan
+
+
+def save_checkpoint(plan: ResumePlan, state: Any) -> Optional[str]:
+    if not plan.save:
+        return None
+    ckpt_id = f"{plan.config_key}-e{plan.epochs_total}"
+    _STORE.put(ckpt_id, Checkpoint(ckpt_id, plan.config_key, plan.epochs_total, state))
+    return ckpt_id
+
+
+def resume_extras(plan: ResumePlan, ckpt_id: Optional[str]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {
+        "checkpoint_id": ckpt_id,
+        "epochs_reused": plan.epochs_reused,
+        "epochs_trained": plan.epochs_to_train,
+    }
+    if plan.note:
+        out["resume_note"] = plan.note
+    return out
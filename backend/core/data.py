@@ -1,10 +1,12 @@
 from typing import Tuple, Optional, Dict, Any
-import io, re
+import re
 import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 
+from core.formats import Source, read_table
+
 def _norm(s: str) -> str:
     return re.sub(r"[^a-z0-9]", "", s.lower())
 
@@ -30,8 +32,12 @@ def _infer_target_column(df: pd.DataFrame, requested: Optional[str]):
             return c, f"Target not provided/found; using low-cardinality column '{c}'."
     raise ValueError(f"Could not infer target column. Available columns: {cols}.")
 
-def prepare_data_from_csv(csv_bytes: bytes, target_col_requested: Optional[str]):
-    df = pd.read_csv(io.BytesIO(csv_bytes))
+def prepare_data_from_csv(source: Source, target_col_requested: Optional[str], filename: Optional[str] = None):
+    """Load an upload (CSV bytes, or a spooled CSV/Parquet/Feather/npy/npz path) and prepare it."""
+    df = read_table(source, filename=filename)
+    return prepare_data_from_df(df, target_col_requested)
+
+def prepare_data_from_df(df: pd.DataFrame, target_col_requested: Optional[str]):
     target_used, target_note = _infer_target_column(df, target_col_requested)
 
     y_raw = df[target_used]
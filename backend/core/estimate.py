@@ -0,0 +1,531 @@
+# backend/core/estimate.py
+"""
+Pre-run cost model: predicted train/infer seconds and peak working-set memory
+for every registry runner, from (rows, features, classes, params).
+
+Each runner is an analytic count of work in a few unit kinds (BLAS flops,
+statevector amplitude updates, PennyLane circuit calls, framework steps).
+Unit costs start from built-in defaults, are re-measured by `calibrate()`
+(micro-benchmarks of the real circuits) and are then corrected per runner by
+the median observed/predicted ratio of stored runs.
+"""
+from __future__ import annotations
+import math
+import os
+import threading
+import time
+import warnings
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# seconds per unit
+DEFAULT_RATES: Dict[str, float] = {
+    "flop": 5e-11,            # dense BLAS
+    "amp": 3e-9,              # one complex amplitude touched by a statevector gate
+    "mixed_call": 2e-3,       # default.mixed qnode: fixed cost per call
+    "mixed_op": 1.5e-3,       #   ... per operation
+    "mixed_elem": 2e-8,       #   ... per operation per density-matrix element
+    "mixed_grad": 3.0,        # backprop call / forward call
+    "qubit_call": 2e-3,       # default.qubit qnode (qnn_simple circuit), forward
+    "qubit_grad": 3.0,
+    "sk_fit": 5e-3,           # fixed cost of one sklearn fit
+    "rf_tree": 5e-3,          # fitting one forest tree on a small sample
+    "rf_tree_infer": 1e-4,    # one tree's predict_proba call
+    "py_step": 5e-4,          # sklearn MLP minibatch step overhead
+    "torch_step": 3e-4,       # torch optimizer step overhead
+    "torch_qubit_batch": 5e-3,  # TorchLayer qnode per batch
+    "tf_epoch": 5e-2,
+    "tf_step": 1e-3,
+}
+
+_MB = 1024.0 * 1024.0
+
+
+@dataclass(frozen=True)
+class Shape:
+    n_train: int
+    n_test: int
+    features: int
+    classes: int
+
+    @classmethod
+    def from_rows(cls, rows: int, features: int, classes: int, test_size: float = 0.2) -> "Shape":
+        """Same split sizes as core.data (train_test_split, test_size=0.2)."""
+        n_test = int(math.ceil(rows * test_size))
+        return cls(max(1, rows - n_test), max(1, n_test), max(1, features), max(2, classes))
+
+
+@dataclass
+class Cost:
+    """Work per phase, as {unit: count}, plus peak bytes."""
+    train: Dict[str, float]
+    infer: Dict[str, float]
+    peak_bytes: float
+    basis: Dict[str, Any]
+
+
+def _p(params: Dict, key: str, default, cast=int):
+    v = params.get(key)
+    return cast(default) if v in (None, "") else cast(v)
+
+def _log2(n: float) -> float:
+    return math.log2(max(2.0, n))
+
+def _base_bytes(s: Shape) -> float:
+    # raw frame + float matrix + scaled split copies
+    return (s.n_train + s.n_test) * s.features * 8.0 * 4
+
+
+# ---------------------------
+# Per-runner models
+# ---------------------------
+def _cost_logreg(s: Shape, params: Dict) -> Cost:
+    iters = 100
+    return Cost({"flop": iters * s.n_train * s.features * s.classes * 4, "sk_fit": 1},
+                {"flop": s.n_test * s.features * s.classes * 2},
+                _base_bytes(s) + s.n_train * s.classes * 8 * 4,
+                {"iterations": iters})
+
+def _cost_svm(s: Shape, params: Dict) -> Cost:
+    # probability=True: 5-fold Platt scaling + final fit; SMO revisits each of ~n^2 kernel pairs several times
+    per_pair = 10 * (3 * s.features + 20)
+    return Cost({"flop": 6 * s.n_train ** 2 * per_pair, "sk_fit": 6},
+                {"flop": s.n_test * s.n_train * per_pair},
+                _base_bytes(s) + min(s.n_train ** 2 * 8.0, 200 * _MB),
+                {"fits": 6})
+
+def _cost_rf(s: Shape, params: Dict) -> Cost:
+    n_est = _p(params, "n_estimators", 200)
+    depth = params.get("max_depth")
+    depth = None if depth in (None, "", "null") else int(depth)
+    levels = min(depth, _log2(s.n_train)) if depth else _log2(s.n_train)
+    nodes = min(2.0 * s.n_train, 2.0 ** (depth + 1)) if depth else 2.0 * s.n_train
+    # branchy split search: ~100 flop-equivalents per sample, feature and level
+    return Cost({"flop": n_est * math.sqrt(s.features) * s.n_train * _log2(s.n_train) * levels * 100,
+                 "rf_tree": n_est},
+                {"flop": n_est * s.n_test * levels * 20, "rf_tree_infer": n_est},
+                _base_bytes(s) + n_est * nodes * (80 + 8 * s.classes),
+                {"n_estimators": n_est})
+
+def _cost_mlp(s: Shape, params: Dict) -> Cost:
+    epochs = _p(params, "epochs", 50)
+    batch = _p(params, "batch_size", 32)
+    width = s.features * 64 + 64 * s.classes
+    steps = epochs * math.ceil(s.n_train / batch)
+    return Cost({"flop": epochs * s.n_train * width * 6, "py_step": steps, "sk_fit": 1},
+                {"flop": s.n_test * width * 2},
+                _base_bytes(s) + width * 8 * 6 + max(batch, s.n_test) * (64 + s.classes) * 8 * 2,
+                {"epochs": epochs, "steps": steps})
+
+def _cost_mlp_torch(s: Shape, params: Dict) -> Cost:
+    hidden = params.get("hidden", [64, 64])
+    hidden = [int(h) for h in hidden] if isinstance(hidden, (list, tuple)) else [int(hidden)]
+    epochs = _p(params, "epochs", 20)
+    batch = _p(params, "batch_size", 64)
+    dims = [s.features] + hidden + [s.classes]
+    width = sum(a * b for a, b in zip(dims, dims[1:]))
+    steps = epochs * math.ceil(s.n_train / batch)
+    return Cost({"flop": epochs * s.n_train * width * 6, "torch_step": steps},
+                {"flop": s.n_test * width * 2},
+                _base_bytes(s) + width * 4 * 4 + s.n_test * sum(dims) * 4,
+                {"epochs": epochs, "steps": steps})
+
+def _cost_stream(s: Shape, params: Dict, key: str) -> Cost:
+    # in-memory registry runner: `epochs` reshuffled passes, one partial_fit per chunk_rows rows
+    epochs = _p(params, "epochs", 20)
+    calls = epochs * math.ceil(s.n_train / min(_p(params, "chunk_rows", 50_000), s.n_train))
+    steps = 0
+    if key == "mlp_stream":
+        width = _p(params, "hidden", 64)
+        per_row = s.features * width + width * s.classes
+        steps = epochs * math.ceil(s.n_train / _p(params, "batch_size", 256))
+    elif key == "sgd_rbf":
+        width = _p(params, "n_components", 300)
+        per_row = s.features * width + 4 * width + width * s.classes   # projection + cos + linear
+    else:
+        width = s.features
+        per_row = width * s.classes
+    return Cost({"flop": epochs * s.n_train * per_row * 6, "py_step": calls + steps},
+                {"flop": s.n_test * per_row * 2, "sk_fit": 1},
+                _base_bytes(s) + min(_p(params, "chunk_rows", 50_000), s.n_train) * (s.features + width) * 8.0 * 2,
+                {"epochs": epochs, "partial_fit_calls": calls})
+
+def _vqc_ops(n_qubits: int, layers: int, noisy: bool) -> int:
+    # per layer: n RY, n-1 CNOT, n Rot, (+ n depolarizing channels)
+    return layers * (3 * n_qubits - 1 + (n_qubits if noisy else 0))
+
+def _cost_vqc(s: Shape, params: Dict, epochs_key: str = "epochs") -> Cost:
+    n = _p(params, "n_qubits", 2)
+    layers = _p(params, "layers", 4)
+    epochs = _p(params, epochs_key, 50)
+    noise_p = _p(params, "noise_prob", 0.01, float)
+    heads = s.classes
+    batch = min(32, s.n_train)
+    if str(params.get("noise_model") or "mixed") == "trajectory":
+        T = max(2, _p(params, "trajectories", 64))
+        dim = 2 ** n
+        fwd_ops = layers * (3 * n - 1 + (n if noise_p else 0))
+        train_ops = layers * (5 * n - 1 + (n if noise_p else 0))   # Rot split into RZ RY RZ
+        # forward + reverse sweep of state and adjoint, plus one generator product per angle
+        train_amps = heads * epochs * batch * T * dim * (3 * train_ops + 2 * 3 * n * layers)
+        infer_amps = heads * s.n_test * T * dim * fwd_ops
+        chunk_amps = min(batch * T * dim, max(T * dim, 2 ** 22))
+        peak = 5 * chunk_amps * 16.0 + s.n_test * T * layers * n + _base_bytes(s)
+        return Cost({"amp": train_amps}, {"amp": infer_amps}, peak,
+                    {"noise_model": "trajectory", "n_qubits": n, "trajectories": T,
+                     "circuit_evals": heads * (epochs * batch + s.n_test) * T})
+    G = _vqc_ops(n, layers, bool(noise_p))
+    elems = 4.0 ** n
+    per_call = {"mixed_call": 1.0, "mixed_op": G, "mixed_elem": G * elems}
+    train_calls = heads * epochs * batch
+    infer_calls = heads * s.n_test
+    train = {k: v * train_calls for k, v in per_call.items()}
+    train["mixed_grad"] = 1.0  # marker: scale train calls by the backprop factor
+    # backprop keeps every intermediate density matrix of one call alive
+    peak = (G + 2) * elems * 16.0 * 2 + _base_bytes(s)
+    return Cost(train, {k: v * infer_calls for k, v in per_call.items()}, peak,
+                {"noise_model": "mixed", "n_qubits": n, "density_matrix_elems": int(elems),
+                 "circuit_evals": train_calls + infer_calls})
+
+def _cost_qnn_simple(s: Shape, params: Dict) -> Cost:
+    epochs = _p(params, "epochs", 25)
+    # full-batch gradient descent: every training row is a circuit call per epoch
+    train_calls = s.classes * epochs * s.n_train
+    return Cost({"qubit_call": train_calls, "qubit_grad": 1.0},
+                {"qubit_call": s.classes * s.n_test},
+                _base_bytes(s) + s.n_train * 64 * 8.0,
+                {"circuit_evals": train_calls + s.classes * s.n_test})
+
+def _cost_hybrid_torch(s: Shape, params: Dict) -> Cost:
+    n = _p(params, "n_qubits", max(2, min(6, s.features)))
+    layers = _p(params, "layers", 2)
+    epochs = _p(params, "epochs", 15)
+    batch = _p(params, "batch_size", 32)
+    steps = epochs * math.ceil(s.n_train / batch)
+    ops = 2 * n + layers * 2 * n
+    amps = 3 * epochs * s.n_train * ops * 2 ** n
+    return Cost({"amp": amps, "torch_qubit_batch": steps, "torch_step": steps},
+                {"amp": s.n_test * ops * 2 ** n, "torch_qubit_batch": 1},
+                _base_bytes(s) + max(batch, s.n_test) * ops * 2 ** n * 16.0,
+                {"n_qubits": n, "steps": steps})
+
+def _cost_aec_qnn(s: Shape, params: Dict) -> Cost:
+    enc = _p(params, "encoding_dim", min(4, s.features))
+    ae_epochs = _p(params, "ae_epochs", 20)
+    batch = _p(params, "batch_size", 32)
+    q = dict(params)
+    q.setdefault("n_qubits", max(2, min(6, enc)))
+    if (params.get("reducer") or "autoencoder") == "autoencoder":
+        ae_steps = ae_epochs * math.ceil(s.n_train / batch)
+        ae = {"flop": ae_epochs * s.n_train * 2 * s.features * enc * 6,
+              "tf_epoch": ae_epochs, "tf_step": ae_steps}
+    else:
+        ae = {}
+    c = _cost_vqc(Shape(s.n_train, s.n_test, enc, s.classes), q, epochs_key="q_epochs")
+    for k, v in ae.items():
+        c.train[k] = c.train.get(k, 0.0) + v
+    c.basis["encoding_dim"] = enc
+    return c
+
+def _cost_qsvm_kernel(s: Shape, params: Dict) -> Cost:
+    n = _p(params, "n_qubits", 4)
+    layers = _p(params, "layers", 2)
+    dim = 2 ** n
+    embed = layers * (2 * n - 1) * dim / 2  # real amplitudes: half a complex update
+    per_pair = 3 * s.features + 20
+    # one SVC fit on the precomputed Gram matrix (no Platt cross-validation)
+    return Cost({"amp": s.n_train * embed, "flop": 2.0 * s.n_train ** 2 * dim + s.n_train ** 2 * per_pair,
+                 "sk_fit": 1},
+                {"amp": s.n_test * embed, "flop": 2.0 * s.n_test * s.n_train * dim + s.n_test * s.n_train * 10},
+                _base_bytes(s) + (s.n_train + s.n_test) * dim * 8.0
+                + s.n_train ** 2 * 8.0 * 2 + s.n_test * s.n_train * 8.0,
+                {"n_qubits": n, "kernel_entries": s.n_train ** 2 + s.n_test * s.n_train})
+
+COST_MODELS: Dict[Tuple[str, str], Callable[[Shape, Dict], Cost]] = {
+    ("classical", "logreg"): _cost_logreg,
+    ("classical", "svm"): _cost_svm,
+    ("classical", "rf"): _cost_rf,
+    ("classical", "mlp"): _cost_mlp,
+    ("classical", "mlp_torch"): _cost_mlp_torch,
+    ("classical", "sgd_logreg"): lambda s, p: _cost_stream(s, p, "sgd_logreg"),
+    ("classical", "sgd_rbf"): lambda s, p: _cost_stream(s, p, "sgd_rbf"),
+    ("classical", "mlp_stream"): lambda s, p: _cost_stream(s, p, "mlp_stream"),
+    ("quantum", "qnn"): _cost_vqc,
+    ("quantum", "vqc"): _cost_vqc,
+    ("quantum", "qnn_simple"): _cost_qnn_simple,
+    ("quantum", "hybrid_torch"): _cost_hybrid_torch,
+    ("quantum", "aec_qnn"): _cost_aec_qnn,
+    ("quantum", "qsvm_kernel"): _cost_qsvm_kernel,
+}
+
+# Params that scale work ~linearly and may be lowered to fit a budget: (key, default, floor)
+DOWNSCALE_KNOBS: Dict[str, List[Tuple[str, float, float]]] = {
+    "mlp": [("epochs", 50, 1)],
+    "mlp_torch": [("epochs", 20, 1)],
+    "rf": [("n_estimators", 200, 10)],
+    "sgd_logreg": [("epochs", 20, 1)],
+    "sgd_rbf": [("epochs", 20, 1)],
+    "mlp_stream": [("epochs", 20, 1)],
+    "qnn": [("epochs", 50, 1), ("trajectories", 64, 8)],
+    "vqc": [("epochs", 50, 1), ("trajectories", 64, 8)],
+    "qnn_simple": [("epochs", 25, 1)],
+    "hybrid_torch": [("epochs", 15, 1)],
+    "aec_qnn": [("q_epochs", 50, 1), ("ae_epochs", 20, 1), ("trajectories", 64, 8)],
+}
+
+
+# ---------------------------
+# Estimator
+# ---------------------------
+def _best_of(fn: Callable[[], Any], repeat: int = 3) -> float:
+    fn()
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+class Estimator:
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        self.rates = dict(DEFAULT_RATES if rates is None else rates)
+        self.corrections: Dict[str, float] = {}         # on train_s, from observed train_ms
+        self.infer_corrections: Dict[str, float] = {}   # on infer_s, from observed infer_ms
+        self.calibration: Dict[str, Any] = {"source": "defaults", "benchmarked_at": None, "runs_used": 0}
+        self._lock = threading.Lock()
+
+    # ---- prediction ----
+    def _seconds(self, work: Dict[str, float], rates: Dict[str, float]) -> float:
+        work = dict(work)
+        grad = 1.0
+        if work.pop("mixed_grad", None):
+            grad = rates["mixed_grad"]
+        if work.pop("qubit_grad", None):
+            grad = rates["qubit_grad"]
+        total = 0.0
+        for unit, count in work.items():
+            c = rates[unit] * count
+            total += c * grad if unit.startswith(("mixed_", "qubit_")) else c
+        return total
+
+    def estimate(self, family: str, model: str, shape: Shape, params: Optional[Dict] = None,
+                 corrected: bool = True) -> Dict[str, Any]:
+        fn = COST_MODELS.get((family, model))
+        if fn is None:
+            raise ValueError(f"No cost model for {family} model '{model}'.")
+        cost = fn(shape, params or {})
+        with self._lock:
+            rates = dict(self.rates)
+            k = self.corrections.get(model, 1.0) if corrected else 1.0
+            k_infer = self.infer_corrections.get(model, 1.0) if corrected else 1.0
+        train_s = self._seconds(cost.train, rates) * k
+        infer_s = self._seconds(cost.infer, rates) * k_infer
+        return {
+            "family": family,
+            "model": model,
+            "train_s": train_s,
+            "infer_s": infer_s,
+            "total_s": train_s + infer_s,
+            "peak_mb": cost.peak_bytes / _MB,
+            "basis": {"n_train": shape.n_train, "n_test": shape.n_test, "features": shape.features,
+                      "classes": shape.classes} | cost.basis,
+            "correction": k,
+            "infer_correction": k_infer,
+        }
+
+    # ---- calibration ----
+    def calibrate(self) -> Dict[str, float]:
+        """Micro-benchmark the unit costs on this machine (a few seconds)."""
+        from core import statevector as sv
+        rates: Dict[str, float] = {}
+        rng = np.random.default_rng(0)
+
+        a = rng.normal(size=(384, 384))
+        rates["flop"] = _best_of(lambda: a @ a) / (2 * 384 ** 3)
+
+        state = sv.zero_state(64, 12)
+        U = sv.ry_matrices(rng.uniform(size=64))
+        rates["amp"] = _best_of(lambda: sv.apply_1q(state, U, 5)) / (64 * 2 ** 12)
+
+        rates.update(self._calibrate_sklearn(rng))
+        try:
+            rates.update(self._calibrate_pennylane(rng))
+        except Exception as e:
+            print(f"estimate: pennylane calibration skipped ({e})")
+
+        with self._lock:
+            self.rates.update(rates)
+            self.calibration.update({"source": "benchmark", "benchmarked_at": time.time()})
+        return rates
+
+    @staticmethod
+    def _calibrate_sklearn(rng) -> Dict[str, float]:
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.neural_network import MLPClassifier
+
+        X = rng.normal(size=(64, 4))
+        y = (X[:, 0] > 0).astype(int)
+        rf = RandomForestClassifier(n_estimators=20, random_state=0)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # ConvergenceWarning from the deliberately short MLP fit
+            return {
+                "sk_fit": _best_of(lambda: LogisticRegression().fit(X, y)),
+                "rf_tree": _best_of(lambda: rf.fit(X, y), repeat=2) / 20,
+                "rf_tree_infer": _best_of(lambda: rf.predict_proba(X)) / 20,
+                # 5 epochs x 4 minibatches
+                "py_step": _best_of(lambda: MLPClassifier(hidden_layer_sizes=(64,), batch_size=16, max_iter=5,
+                                                          random_state=0).fit(X, y), repeat=2) / 20,
+            }
+
+    @staticmethod
+    def _calibrate_pennylane(rng) -> Dict[str, float]:
+        import pennylane as qml
+        from pennylane import numpy as pnp
+        from models.vqc_ovr import _build_qnn
+        from models.qnn_simple_2qubit import _make_qnode
+
+        def mixed(n, layers, grad):
+            qnn, _ = _build_qnn(n, layers, 0.01, None)
+            x = rng.uniform(size=n)
+            w = pnp.array(rng.normal(size=(layers, n, 3)), requires_grad=True)
+            if grad:
+                return _best_of(lambda: qml.grad(lambda v: qnn(x, v))(w))
+            return _best_of(lambda: qnn(x, w))
+
+        # fwd(n, L) = call + G * op + G * 4^n * elem; two 1-qubit depths separate call/op,
+        # a 4-qubit circuit then pins the per-element term
+        g1, g4, g44 = _vqc_ops(1, 1, True), _vqc_ops(1, 4, True), _vqc_ops(4, 1, True)
+        t1, t4, t44 = mixed(1, 1, False), mixed(1, 4, False), mixed(4, 1, False)
+        op = max((t4 - t1) / (g4 - g1), 1e-6)
+        call = max(t1 - g1 * op, 1e-5)
+        elem = max((t44 - call - g44 * op) / (g44 * 4 ** 4), 1e-10)
+        grad = max(mixed(1, 4, True) / t4, 1.0)
+
+        qnode = _make_qnode()
+        x = rng.uniform(size=2)
+        w = pnp.array(rng.uniform(size=4), requires_grad=True)
+        q_fwd = _best_of(lambda: qnode(x, w))
+        q_grad = _best_of(lambda: qml.grad(lambda v: qnode(x, v))(w))
+        return {"mixed_call": call, "mixed_op": op, "mixed_elem": elem, "mixed_grad": grad,
+                "qubit_call": q_fwd, "qubit_grad": max(q_grad / q_fwd, 1.0)}
+
+    def calibrate_from_runs(self, runs: List[Dict[str, Any]], min_runs: int = 3) -> Dict[str, float]:
+        """
+        Per-runner correction = median(observed train_ms / predicted train_ms) over stored
+        runs (RunStore.list_runs items), and likewise for infer_ms into infer_corrections.
+        Runners with fewer than `min_runs` keep 1.0.
+        """
+        ratios: Dict[str, List[float]] = {}
+        infer_ratios: Dict[str, List[float]] = {}
+        for run in runs:
+            if not run.get("n_samples") or not run.get("n_features"):
+                continue
+            if run.get("kind") == "stream":
+                continue  # out-of-core runs include file I/O the in-memory cost models do not count
+            shape = Shape.from_rows(run["n_samples"], run["n_features"], run.get("n_classes") or 2)
+            for m in run.get("models", []):
+                timings = m.get("timings") or {}
+                observed = timings.get("train_ms")
+                if m.get("error") or not observed or (m["family"], m["model"]) not in COST_MODELS:
+                    continue
+                pred = self.estimate(m["family"], m["model"], shape, m.get("params") or {}, corrected=False)
+                if pred["train_s"] > 0:
+                    ratios.setdefault(m["model"], []).append(observed / 1000.0 / pred["train_s"])
+                # runners that do not time prediction separately report infer_ms = 0
+                if timings.get("infer_ms") and pred["infer_s"] > 0:
+                    infer_ratios.setdefault(m["model"], []).append(timings["infer_ms"] / 1000.0 / pred["infer_s"])
+
+        def fit(by_model: Dict[str, List[float]]) -> Dict[str, float]:
+            return {model: float(np.clip(np.median(r), 0.02, 50.0))
+                    for model, r in by_model.items() if len(r) >= min_runs}
+        corrections, infer_corrections = fit(ratios), fit(infer_ratios)
+        with self._lock:
+            self.corrections.update(corrections)
+            self.infer_corrections.update(infer_corrections)
+            self.calibration["runs_used"] = sum(len(r) for r in ratios.values())
+            if corrections:
+                self.calibration["source"] = self.calibration["source"] + "+runs"
+        return corrections
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"calibration": dict(self.calibration), "rates": dict(self.rates),
+                    "corrections": dict(self.corrections),
+                    "infer_corrections": dict(self.infer_corrections)}
+
+
+# ---------------------------
+# Budgets
+# ---------------------------
+class BudgetExceeded(ValueError):
+    pass
+
+
+@dataclass
+class Budget:
+    max_seconds: Optional[float] = None
+    max_mb: Optional[float] = None
+    action: str = "refuse"   # or "downscale"
+
+    @classmethod
+    def from_env(cls) -> "Budget":
+        """QML_BUDGET_SECONDS / QML_BUDGET_MB per runner; QML_BUDGET_ACTION=refuse|downscale."""
+        sec = os.environ.get("QML_BUDGET_SECONDS")
+        mb = os.environ.get("QML_BUDGET_MB")
+        return cls(float(sec) if sec else None, float(mb) if mb else None,
+                   os.environ.get("QML_BUDGET_ACTION", "refuse").strip().lower())
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_seconds is not None or self.max_mb is not None
+
+    def overrun(self, est: Dict[str, Any]) -> float:
+        """Largest estimate/limit ratio (<= 1 means within budget)."""
+        r = 0.0
+        if self.max_seconds:
+            r = max(r, est["total_s"] / self.max_seconds)
+        if self.max_mb:
+            r = max(r, est["peak_mb"] / self.max_mb)
+        return r
+
+    def describe(self) -> Dict[str, Any]:
+        return {"max_seconds": self.max_seconds, "max_mb": self.max_mb, "action": self.action}
+
+    def apply(self, estimator: Estimator, family: str, model: str, shape: Shape,
+              params: Dict) -> Tuple[Dict, Dict[str, Any]]:
+        """
+        Returns (params to run with, estimate). With action=downscale, lowers the
+        runner's work knobs (epochs, trees, trajectories) until the estimate fits.
+        Raises BudgetExceeded when it cannot fit.
+        """
+        est = estimator.estimate(family, model, shape, params)
+        if not self.enabled or self.overrun(est) <= 1.0:
+            return params, est
+        if self.action == "downscale":
+            new = dict(params)
+            changed: Dict[str, Any] = {}
+            for key, default, floor in DOWNSCALE_KNOBS.get(model, []):
+                start = _p(new, key, default, float)
+                # fixed costs (inference, fit overhead) do not shrink with the knob, so refine a few times
+                for _ in range(4):
+                    ratio = self.overrun(est)
+                    cur = _p(new, key, default, float)
+                    val = max(floor, math.floor(cur / ratio * 0.95))
+                    if ratio <= 1.0 or val >= cur:
+                        break
+                    trial = dict(new, **{key: int(val)})
+                    trial_est = estimator.estimate(family, model, shape, trial)
+                    if self.overrun(trial_est) >= ratio:
+                        break  # knob does not apply to this configuration (e.g. trajectories in mixed mode)
+                    new, est = trial, trial_est
+                    changed[key] = {"from": int(start), "to": int(val)}
+            if self.overrun(est) <= 1.0:
+                return new, est | {"downscaled": changed}
+        raise BudgetExceeded(
+            f"{family} model '{model}' is estimated at {est['total_s']:.1f}s / {est['peak_mb']:.1f} MB, "
+            f"over the budget ({self.max_seconds or '-'}s / {self.max_mb or '-'} MB)."
+        )
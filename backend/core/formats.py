@@ -0,0 +1,325 @@
+# backend/core/formats.py
+from __future__ import annotations
+import hashlib
+import io
+import os
+import tempfile
+import zipfile
+from typing import Iterator, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# pyarrow backs Parquet / Feather; keep optional so CSV-only installs still work
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.feather as pa_feather  # type: ignore
+    import pyarrow.parquet as pa_parquet  # type: ignore
+    _HAS_ARROW = True
+except Exception as e:
+    _HAS_ARROW = False
+    _ARROW_ERR = e
+
+Source = Union[bytes, str, "os.PathLike[str]"]
+
+_CSV_SEPS = (",", ";", "\t", "|")
+
+FORMATS = ("csv", "parquet", "feather", "npy", "npz")
+
+_EXTENSIONS = {
+    ".csv": "csv", ".tsv": "csv", ".txt": "csv",
+    ".parquet": "parquet", ".pq": "parquet",
+    ".feather": "feather", ".arrow": "feather", ".ipc": "feather",
+    ".npy": "npy",
+    ".npz": "npz",
+}
+
+
+def _ensure_arrow(fmt: str):
+    if not _HAS_ARROW:
+        raise RuntimeError(f"{fmt} uploads require pyarrow. Install: pip install pyarrow ({_ARROW_ERR})")
+
+
+def detect_format(head: bytes, filename: Optional[str] = None) -> str:
+    """Sniff the upload format from magic bytes, falling back to the file extension, then CSV."""
+    if head.startswith(b"PAR1"):
+        return "parquet"
+    if head.startswith(b"ARROW1") or head.startswith(b"FEA1"):
+        return "feather"
+    if head.startswith(b"\x93NUMPY"):
+        return "npy"
+    if head.startswith(b"PK\x03\x04") or head.startswith(b"PK\x05\x06"):
+        return "npz"
+    if filename:
+        ext = os.path.splitext(filename)[1].lower()
+        if ext in _EXTENSIONS:
+            return _EXTENSIONS[ext]
+    return "csv"
+
+
+def _zip_has_npy(source: Source) -> bool:
+    try:
+        with zipfile.ZipFile(io.BytesIO(source) if _is_bytes(source) else source) as zf:
+            return any(n.endswith(".npy") for n in zf.namelist())
+    except zipfile.BadZipFile:
+        return False
+
+
+def _resolve_format(source: Source, filename: Optional[str], fmt: Optional[str]) -> str:
+    if fmt is None:
+        fmt = detect_format(_read_head(source), filename)
+        # any zip starts with PK; only archives of .npy members are npz
+        if fmt == "npz" and not _zip_has_npy(source):
+            raise ValueError("Zip archive has no .npy members; only .npz archives are supported.")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}'. Supported: {list(FORMATS)}")
+    return fmt
+
+
+def spool_to_disk(fileobj, suffix: str = "") -> Tuple[str, str]:
+    """
+    Copy a file-like upload to a named temp file (caller deletes).
+    Returns (path, sha256 hex digest of the content), hashed while copying.
+    """
+    digest = hashlib.sha256()
+    fd, path = tempfile.mkstemp(prefix="qmlc-", suffix=suffix)
+    with os.fdopen(fd, "wb") as out:
+        while True:
+            chunk = fileobj.read(1024 * 1024)
+            if not chunk:
+                break
+            digest.update(chunk)
+            out.write(chunk)
+    return path, digest.hexdigest()
+
+
+def _is_bytes(source: Source) -> bool:
+    return isinstance(source, (bytes, bytearray, memoryview))
+
+
+def _read_head(source: Source, n: int = 8) -> bytes:
+    if _is_bytes(source):
+        return bytes(source[:n])
+    with open(source, "rb") as fh:
+        return fh.read(n)
+
+
+def _row_slices(n: int, chunk_rows: int) -> Iterator[slice]:
+    for start in range(0, n, chunk_rows):
+        yield slice(start, min(start + chunk_rows, n))
+
+
+def _array_to_frame(arr: np.ndarray) -> pd.DataFrame:
+    """Wrap an array without copying; unnamed 2-D arrays get x0..xN columns."""
+    if arr.dtype.names:
+        return pd.DataFrame(arr)
+    if arr.ndim == 1:
+        arr = arr.reshape(-1, 1)
+    if arr.ndim != 2:
+        raise ValueError(f"Expected a 2-D array, got shape {arr.shape}.")
+    return pd.DataFrame(arr, columns=[f"x{i}" for i in range(arr.shape[1])], copy=False)
+
+
+def _read_csv(source: Source) -> pd.DataFrame:
+    """Try common delimiters, require >= 2 columns."""
+    def _open():
+        return io.BytesIO(source) if _is_bytes(source) else source
+    for sep in _CSV_SEPS:
+        try:
+            df = pd.read_csv(_open(), sep=sep)
+            if df.shape[1] >= 2:
+                return df
+        except Exception:
+            continue
+    # final attempt, let pandas raise how it wants
+    return pd.read_csv(_open())
+
+
+def _sniff_csv_sep(source: Source) -> Optional[str]:
+    """Same delimiter choice as _read_csv, decided from the first rows only."""
+    for sep in _CSV_SEPS:
+        try:
+            head = pd.read_csv(io.BytesIO(source) if _is_bytes(source) else source, sep=sep, nrows=64)
+            if head.shape[1] >= 2:
+                return sep
+        except Exception:
+            continue
+    return None
+
+
+def _read_npy(source: Source, mmap: bool = True) -> pd.DataFrame:
+    if _is_bytes(source) or not mmap:
+        fh = io.BytesIO(source) if _is_bytes(source) else source
+        return _array_to_frame(np.load(fh, allow_pickle=False))
+    # mmap_mode keeps the rows on disk until a column is actually touched
+    return _array_to_frame(np.load(source, mmap_mode="r", allow_pickle=False))
+
+
+def _read_npz(source: Source, mmap: bool = True) -> pd.DataFrame:
+    fh = io.BytesIO(source) if _is_bytes(source) else source
+    with np.load(fh, allow_pickle=False) as z:
+        keys = list(z.files)
+        if "X" in keys and "y" in keys:
+            df = _array_to_frame(z["X"])
+            df["label"] = z["y"]
+            return df
+        if len(keys) == 1:
+            return _array_to_frame(z[keys[0]])
+        cols = {k: z[k] for k in keys}
+    if any(v.ndim != 1 for v in cols.values()):
+        raise ValueError(f"npz must hold 'X' and 'y', a single 2-D array, or 1-D columns; got {keys}.")
+    return pd.DataFrame(cols)
+
+
+def _arrow_source(source: Source, mmap: bool = True):
+    # bytes are wrapped zero-copy; paths are memory-mapped unless asked not to be
+    if _is_bytes(source):
+        return pa.BufferReader(pa.py_buffer(source)), False
+    return os.fspath(source), mmap
+
+
+def _read_parquet(source: Source, mmap: bool = True) -> pd.DataFrame:
+    _ensure_arrow("Parquet")
+    src, mmap = _arrow_source(source, mmap)
+    return pa_parquet.read_table(src, memory_map=mmap).to_pandas()
+
+
+def _read_feather(source: Source, mmap: bool = True) -> pd.DataFrame:
+    _ensure_arrow("Feather/Arrow IPC")
+    src, mmap = _arrow_source(source, mmap)
+    # uncompressed IPC files map straight into the table buffers
+    return pa_feather.read_table(src, memory_map=mmap).to_pandas()
+
+
+_READERS = {
+    "parquet": _read_parquet,
+    "feather": _read_feather,
+    "npy": _read_npy,
+    "npz": _read_npz,
+}
+
+
+def read_table(source: Source, filename: Optional[str] = None, fmt: Optional[str] = None,
+               mmap: bool = True) -> pd.DataFrame:
+    """
+    Load an uploaded dataset from raw bytes or a path on disk.
+    Supported: CSV (delimiter sniffed), Parquet, Feather / Arrow IPC, .npy and .npz.
+    With mmap=False nothing keeps the file open once this returns, so the caller may
+    delete it while the frame is still in use (Windows refuses to remove mapped files).
+    """
+    fmt = _resolve_format(source, filename, fmt)
+    if fmt == "csv":
+        return _read_csv(source)
+    return _READERS[fmt](source, mmap)
+
+
+# ---------------------------
+# Chunked reading
+# ---------------------------
+def _iter_csv(source: Source, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    src = io.BytesIO(source) if _is_bytes(source) else source
+    sep = _sniff_csv_sep(source)
+    with pd.read_csv(src, sep=sep if sep else ",", chunksize=chunk_rows) as reader:
+        yield from reader
+
+
+def _iter_npy(source: Source, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    if _is_bytes(source):
+        arr = np.load(io.BytesIO(source), allow_pickle=False)
+    else:
+        arr = np.load(source, mmap_mode="r", allow_pickle=False)
+    for sl in _row_slices(len(arr), chunk_rows):
+        # copy the slice so each chunk pages in only its own rows
+        yield _array_to_frame(np.array(arr[sl]))
+
+
+def _npz_member_chunks(zf: zipfile.ZipFile, name: str, chunk_rows: int) -> Iterator[np.ndarray]:
+    """Row blocks of one .npy member, decompressed incrementally (no full load)."""
+    with zf.open(name) as fh:
+        version = np.lib.format.read_magic(fh)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(fh)
+        elif version == (2, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(fh)
+        else:
+            shape, fortran, dtype = None, True, None
+        if fortran or dtype is None or dtype.hasobject or not shape:
+            # column-major / object / 0-d members cannot be cut into rows from the stream
+            fh.seek(0)
+            arr = np.lib.format.read_array(fh, allow_pickle=False)
+            for sl in _row_slices(len(arr), chunk_rows):
+                yield arr[sl]
+            return
+        row_shape = tuple(shape[1:])
+        row_bytes = dtype.itemsize * int(np.prod(row_shape, dtype=np.int64))
+        for sl in _row_slices(shape[0], chunk_rows):
+            n = sl.stop - sl.start
+            buf = fh.read(n * row_bytes)
+            if len(buf) != n * row_bytes:
+                raise ValueError(f"npz member '{name}' is truncated.")
+            yield np.frombuffer(buf, dtype=dtype).reshape((n,) + row_shape)
+
+
+def _iter_npz(source: Source, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    fh = io.BytesIO(source) if _is_bytes(source) else source
+    with zipfile.ZipFile(fh) as zf:
+        keys = [n[:-4] for n in zf.namelist() if n.endswith(".npy")]
+        streams = {k: _npz_member_chunks(zf, k + ".npy", chunk_rows) for k in keys}
+        if "X" in keys and "y" in keys:
+            for X, y in zip(streams["X"], streams["y"]):
+                df = _array_to_frame(X)
+                df["label"] = y
+                yield df
+        elif len(keys) == 1:
+            for arr in streams[keys[0]]:
+                yield _array_to_frame(arr)
+        else:
+            for parts in zip(*streams.values()):
+                if any(v.ndim != 1 for v in parts):
+                    raise ValueError(f"npz must hold 'X' and 'y', a single 2-D array, or 1-D columns; got {keys}.")
+                yield pd.DataFrame(dict(zip(keys, parts)))
+
+
+def _iter_parquet(source: Source, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    _ensure_arrow("Parquet")
+    src, mmap = _arrow_source(source)
+    with pa_parquet.ParquetFile(src, memory_map=mmap) as pf:
+        for batch in pf.iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+
+
+def _iter_feather(source: Source, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    _ensure_arrow("Feather/Arrow IPC")
+    if _read_head(source, 4) == b"FEA1":
+        # Feather v1 has no record batches; it is small-file legacy, load and slice
+        df = _read_feather(source)
+        for sl in _row_slices(len(df), chunk_rows):
+            yield df.iloc[sl]
+        return
+    # closed when the generator finishes or is closed, so an abandoned scan does not pin the file
+    with (pa.BufferReader(pa.py_buffer(source)) if _is_bytes(source) else pa.memory_map(os.fspath(source))) as src:
+        reader = pa.ipc.open_file(src)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            for sl in _row_slices(batch.num_rows, chunk_rows):
+                yield batch.slice(sl.start, sl.stop - sl.start).to_pandas()
+
+
+_CHUNK_READERS = {
+    "csv": _iter_csv,
+    "parquet": _iter_parquet,
+    "feather": _iter_feather,
+    "npy": _iter_npy,
+    "npz": _iter_npz,
+}
+
+
+def iter_table(source: Source, filename: Optional[str] = None, fmt: Optional[str] = None,
+               chunk_rows: int = 100_000) -> Iterator[pd.DataFrame]:
+    """
+    Like read_table, but yields DataFrames of at most `chunk_rows` rows so a file far
+    larger than memory can be scanned. Columns are the same as read_table would give;
+    dtypes may differ between chunks (e.g. an int CSV column that gains NaNs).
+    """
+    fmt = _resolve_format(source, filename, fmt)
+    return _CHUNK_READERS[fmt](source, max(1, int(chunk_rows)))
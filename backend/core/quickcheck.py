@@ -143,7 +143,7 @@ class ModelSelector:
 
             # Map to YOUR model keys (frontend expects these):
             # classical: mlp | svm | rf | logreg | mlp_torch
-            # quantum:   qnn | vqc | qnn_simple | hybrid_torch | aec_qnn
+            # quantum:   qnn | vqc | qnn_simple | hybrid_torch | aec_qnn | qsvm_kernel
             if d < 50 and mi > 0.05:
                 return {"classical": "mlp", "quantum": "qnn_simple"}
             if d >= 50 and pca > 0.70:
@@ -0,0 +1,110 @@
+# backend/core/reduce.py
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from sklearn.decomposition import PCA
+
+from core.cache import LRUCache, array_fingerprint
+from core.runstore import canonical_json
+
+REDUCERS = ("slice", "random", "pca", "autoencoder")
+
+# Fitted reducers keyed on (train split fingerprint, method, k, seed, options)
+_CACHE = LRUCache(maxsize=32)
+
+
+@dataclass(frozen=True)
+class Projection:
+    """A fitted pre-encoder, applied as one affine map X @ W + b (optionally ReLU)."""
+    method: str
+    W: np.ndarray
+    b: np.ndarray
+    relu: bool = False
+
+    @property
+    def n_components(self) -> int:
+        return int(self.W.shape[1])
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        Z = X @ self.W + self.b
+        return np.maximum(Z, 0.0) if self.relu else Z
+
+
+def _pad(W: np.ndarray, b: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Zero-pad to k outputs when the data has fewer usable directions than requested."""
+    if W.shape[1] >= k:
+        return W, b
+    extra = k - W.shape[1]
+    return np.hstack([W, np.zeros((W.shape[0], extra))]), np.concatenate([b, np.zeros(extra)])
+
+
+def _fit_slice(X: np.ndarray, k: int, seed: int, opts: Dict[str, Any]) -> Projection:
+    d = X.shape[1]
+    W = np.eye(d)[:, :k]
+    W, b = _pad(W, np.zeros(W.shape[1]), k)
+    return Projection("slice", W, b)
+
+
+def _fit_random(X: np.ndarray, k: int, seed: int, opts: Dict[str, Any]) -> Projection:
+    # Same draw as the old in-circuit W (shape k x d from default_rng(seed))
+    W = np.random.default_rng(seed).normal(size=(k, X.shape[1])).T
+    return Projection("random", W, np.zeros(k))
+
+
+def _fit_pca(X: np.ndarray, k: int, seed: int, opts: Dict[str, Any]) -> Projection:
+    n_comp = max(1, min(k, X.shape[0], X.shape[1]))
+    pca = PCA(n_components=n_comp, random_state=seed).fit(X)
+    W = pca.components_.T
+    b = -pca.mean_ @ W
+    W, b = _pad(W, b, k)
+    return Projection("pca", W, b)
+
+
+def _fit_autoencoder(X: np.ndarray, k: int, seed: int, opts: Dict[str, Any]) -> Projection:
+    try:
+        import tensorflow as tf
+        from tensorflow.keras import Model
+        from tensorflow.keras.layers import Input, Dense
+        from tensorflow.keras.optimizers import Adam
+    except Exception as e:
+        raise RuntimeError(f"autoencoder reducer requires tensorflow. Install: pip install tensorflow-cpu ({e})")
+
+    tf.random.set_seed(seed)
+    inp = Input(shape=(X.shape[1],))
+    enc_layer = Dense(k, activation="relu")
+    enc = enc_layer(inp)
+    dec = Dense(X.shape[1], activation="linear")(enc)
+    auto = Model(inputs=inp, outputs=dec)
+    auto.compile(optimizer=Adam(learning_rate=float(opts.get("lr", 0.001))), loss="mse")
+    auto.fit(X, X, epochs=int(opts.get("epochs", 20)), batch_size=int(opts.get("batch_size", 32)), verbose=0)
+    # Pull the encoder weights out so inference is plain numpy (no TF graph per call)
+    W, b = enc_layer.get_weights()
+    return Projection("autoencoder", np.asarray(W, dtype=float), np.asarray(b, dtype=float), relu=True)
+
+
+_FITTERS = {
+    "slice": _fit_slice,
+    "random": _fit_random,
+    "pca": _fit_pca,
+    "autoencoder": _fit_autoencoder,
+}
+
+
+def fit_reducer(
+    method: str,
+    X_tr: np.ndarray,
+    n_components: int,
+    seed: int = 7,
+    options: Optional[Dict[str, Any]] = None,
+) -> Tuple[Projection, bool]:
+    """
+    Fit (or fetch from cache) a pre-encoder mapping X_tr's columns to n_components.
+    Returns (projection, cache_hit).
+    """
+    if method not in _FITTERS:
+        raise ValueError(f"Unknown reducer '{method}'. Available: {list(REDUCERS)}")
+    opts = dict(options or {})
+    key = (array_fingerprint(X_tr), method, int(n_components), int(seed), canonical_json(opts))
+    return _CACHE.get_or_create(key, lambda: _FITTERS[method](X_tr, int(n_components), int(seed), opts))
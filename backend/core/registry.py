@@ -5,10 +5,12 @@ Runner = Callable[[np.ndarray, np.ndarray, np.ndarray, dict, List[str]], Tuple[n
 
 # Always-available classical models (scikit-learn)
 from models.classical_sklearn import run_classical
+from models.classical_stream import run_classical_stream
 
 # Always-available quantum models (PennyLane)
 from models.vqc_ovr import run_vqc_ovr
 from models.qnn_simple_2qubit import run_qnn_simple
+from models.qsvm_kernel import run_qsvm_kernel
 
 def _lazy_mlp_torch() -> Runner:
     def runner(Xtr, ytr, Xte, params, classes):
@@ -34,6 +36,10 @@ _CLASSICAL: Dict[str, Runner] = {
     "rf":       lambda Xtr, ytr, Xte, p, classes: run_classical("rf",  Xtr, ytr, Xte, p, classes),
     "logreg":   lambda Xtr, ytr, Xte, p, classes: run_classical("logreg", Xtr, ytr, Xte, p, classes),
     "mlp_torch": _lazy_mlp_torch(),
+    # incremental (partial_fit) learners; the same models train out-of-core via /api/stream
+    "sgd_logreg": lambda Xtr, ytr, Xte, p, classes: run_classical_stream("sgd_logreg", Xtr, ytr, Xte, p, classes),
+    "sgd_rbf":    lambda Xtr, ytr, Xte, p, classes: run_classical_stream("sgd_rbf", Xtr, ytr, Xte, p, classes),
+    "mlp_stream": lambda Xtr, ytr, Xte, p, classes: run_classical_stream("mlp_stream", Xtr, ytr, Xte, p, classes),
 }
 
 _QUANTUM: Dict[str, Runner] = {
@@ -42,6 +48,7 @@ _QUANTUM: Dict[str, Runner] = {
     "qnn_simple": run_qnn_simple,
     "hybrid_torch": _lazy_hybrid_torch(),
     "aec_qnn":      _lazy_aec_qnn_tf(),
+    "qsvm_kernel":  run_qsvm_kernel,
 }
 
 def get_classical_runner(key: str) -> Runner:
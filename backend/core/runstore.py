@@ -0,0 +1,278 @@
+# backend/core/runstore.py
+from __future__ import annotations
+import json
+import logging
+import platform
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from functools import lru_cache
+from importlib import metadata
+from typing import Any, Dict, Iterator, List, Optional
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_uid      TEXT NOT NULL UNIQUE,
+    created_at   REAL NOT NULL,
+    kind         TEXT NOT NULL,
+    dataset_hash TEXT NOT NULL,
+    filename     TEXT,
+    target       TEXT,
+    n_samples    INTEGER,
+    n_features   INTEGER,
+    n_classes    INTEGER,
+    total_ms     REAL,
+    env_json     TEXT
+);
+CREATE TABLE IF NOT EXISTS run_models (
+    run_id       INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    family       TEXT NOT NULL,
+    model_key    TEXT NOT NULL,
+    params_json  TEXT NOT NULL,
+    metrics_json TEXT,
+    timings_json TEXT,
+    accuracy     REAL,
+    error        TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_dataset ON runs(dataset_hash, created_at);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs(created_at);
+CREATE INDEX IF NOT EXISTS idx_models_key ON run_models(model_key, run_id);
+CREATE INDEX IF NOT EXISTS idx_models_run ON run_models(run_id);
+"""
+
+_ENV_PACKAGES = ("numpy", "pandas", "scikit-learn", "pennylane", "torch", "tensorflow", "fastapi")
+
+
+def canonical_json(obj: Any) -> str:
+    """Stable JSON for params: sorted keys, no whitespace, so equal configs compare equal."""
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+
+
+@lru_cache(maxsize=1)
+def environment_versions() -> Dict[str, Optional[str]]:
+    env: Dict[str, Optional[str]] = {"python": platform.python_version()}
+    for pkg in _ENV_PACKAGES:
+        try:
+            env[pkg] = metadata.version(pkg)
+        except metadata.PackageNotFoundError:
+            env[pkg] = None
+    return env
+
+
+class RunStore:
+    """
+    Embedded SQLite log of comparison runs.
+    `record()` only enqueues; a single background thread owns all writes, so
+    the request path never waits on disk.
+    """
+    def __init__(self, path: str, batch_size: int = 64):
+        self.path = path
+        self.batch_size = batch_size
+        self._q: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        with self._session() as con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.executescript(_SCHEMA)
+        self._writer = threading.Thread(target=self._write_loop, name="runstore-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        con = sqlite3.connect(self.path, timeout=30.0)
+        con.row_factory = sqlite3.Row
+        return con
+
+    @contextmanager
+    def _session(self) -> Iterator[sqlite3.Connection]:
+        con = self._connect()
+        try:
+            yield con
+        finally:
+            con.close()
+
+    # ---- writes ----
+    def record(
+        self,
+        kind: str,
+        dataset_hash: str,
+        dataset_info: Dict[str, Any],
+        models: List[Dict[str, Any]],
+        total_ms: Optional[float] = None,
+        filename: Optional[str] = None,
+    ) -> str:
+        """
+        Queue a run for insertion and return its id immediately.
+        Each model dict: family, model, params, and metrics/timings or error.
+        """
+        run_uid = uuid.uuid4().hex
+        self._q.put({
+            "run_uid": run_uid,
+            "created_at": time.time(),
+            "kind": kind,
+            "dataset_hash": dataset_hash,
+            "filename": filename,
+            "target": dataset_info.get("target"),
+            "n_samples": dataset_info.get("n_samples"),
+            "n_features": dataset_info.get("n_features"),
+            "n_classes": len(dataset_info.get("classes") or []) or None,
+            "total_ms": total_ms,
+            "models": models,
+        })
+        return run_uid
+
+    def _write_loop(self):
+        con = self._connect()
+        try:
+            while True:
+                item = self._q.get()
+                batch = [item]
+                while item is not None and len(batch) < self.batch_size:
+                    try:
+                        item = self._q.get_nowait()
+                    except queue.Empty:
+                        break
+                    batch.append(item)
+                runs = [b for b in batch if b is not None]
+                try:
+                    if runs:
+                        self._insert_batch(con, runs)
+                finally:
+                    for _ in batch:
+                        self._q.task_done()
+                if len(runs) < len(batch):
+                    return
+        finally:
+            con.close()
+
+    def _insert_batch(self, con: sqlite3.Connection, runs: List[Dict[str, Any]]):
+        """One transaction for the batch; if it fails, retry run by run so one bad row drops only itself."""
+        try:
+            self._insert(con, runs)
+            return
+        except Exception as e:
+            if len(runs) == 1:
+                log.error("runstore: dropped run %s: %s", runs[0]["run_uid"], e)
+                return
+        for r in runs:
+            try:
+                self._insert(con, [r])
+            except Exception as e:
+                log.error("runstore: dropped run %s: %s", r["run_uid"], e)
+
+    def _insert(self, con: sqlite3.Connection, runs: List[Dict[str, Any]]):
+        env = canonical_json(environment_versions())
+        with con:
+            for r in runs:
+                cur = con.execute(
+                    "INSERT INTO runs (run_uid, created_at, kind, dataset_hash, filename, target,"
+                    " n_samples, n_features, n_classes, total_ms, env_json) VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+                    (r["run_uid"], r["created_at"], r["kind"], r["dataset_hash"], r["filename"],
+                     r["target"], r["n_samples"], r["n_features"], r["n_classes"], r["total_ms"], env),
+                )
+                run_id = cur.lastrowid
+                con.executemany(
+                    "INSERT INTO run_models (run_id, family, model_key, params_json, metrics_json,"
+                    " timings_json, accuracy, error) VALUES (?,?,?,?,?,?,?,?)",
+                    [
+                        (run_id, m["family"], m["model"], canonical_json(m.get("params", {})),
+                         json.dumps(m["metrics"]) if m.get("metrics") is not None else None,
+                         json.dumps(m["timings"]) if m.get("timings") is not None else None,
+                         (m.get("metrics") or {}).get("accuracy"), m.get("error"))
+                        for m in r["models"]
+                    ],
+                )
+
+    def close(self):
+        """Stop the writer after every run queued so far is written."""
+        self._q.put(None)
+        self._writer.join(timeout=10.0)
+
+    # ---- reads ----
+    def list_runs(
+        self,
+        dataset: Optional[str] = None,
+        model: Optional[str] = None,
+        family: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        where, args = [], []
+        if dataset:
+            where.append("r.dataset_hash = ?"); args.append(dataset)
+        if since is not None:
+            where.append("r.created_at >= ?"); args.append(float(since))
+        if until is not None:
+            where.append("r.created_at < ?"); args.append(float(until))
+        if model or family:
+            sub, sub_args = [], []
+            if model:
+                sub.append("m.model_key = ?"); sub_args.append(model)
+            if family:
+                sub.append("m.family = ?"); sub_args.append(family)
+            where.append(f"r.id IN (SELECT m.run_id FROM run_models m WHERE {' AND '.join(sub)})")
+            args += sub_args
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+        with self._session() as con:
+            total = con.execute(f"SELECT COUNT(*) FROM runs r {clause}", args).fetchone()[0]
+            rows = con.execute(
+                f"SELECT r.* FROM runs r {clause} ORDER BY r.created_at DESC LIMIT ? OFFSET ?",
+                args + [int(limit), int(offset)],
+            ).fetchall()
+            models = self._models_for(con, [row["id"] for row in rows])
+            items = [self._hydrate(row, models.get(row["id"], [])) for row in rows]
+        return {"total": int(total), "limit": int(limit), "offset": int(offset), "items": items}
+
+    def get_run(self, run_uid: str) -> Optional[Dict[str, Any]]:
+        with self._session() as con:
+            row = con.execute("SELECT * FROM runs WHERE run_uid = ?", (run_uid,)).fetchone()
+            if row is None:
+                return None
+            return self._hydrate(row, self._models_for(con, [row["id"]]).get(row["id"], []))
+
+    @staticmethod
+    def _models_for(con: sqlite3.Connection, run_ids: List[int]) -> Dict[int, List[sqlite3.Row]]:
+        """Model rows of every given run in one query, grouped by run id."""
+        out: Dict[int, List[sqlite3.Row]] = {}
+        if not run_ids:
+            return out
+        marks = ",".join("?" * len(run_ids))
+        for m in con.execute(
+            "SELECT run_id, family, model_key, params_json, metrics_json, timings_json, error"
+            f" FROM run_models WHERE run_id IN ({marks}) ORDER BY rowid", run_ids
+        ):
+            out.setdefault(m["run_id"], []).append(m)
+        return out
+
+    @staticmethod
+    def _hydrate(row: sqlite3.Row, models: List[sqlite3.Row]) -> Dict[str, Any]:
+        return {
+            "run_id": row["run_uid"],
+            "created_at": row["created_at"],
+            "kind": row["kind"],
+            "dataset_hash": row["dataset_hash"],
+            "filename": row["filename"],
+            "target": row["target"],
+            "n_samples": row["n_samples"],
+            "n_features": row["n_features"],
+            "n_classes": row["n_classes"],
+            "total_ms": row["total_ms"],
+            "environment": json.loads(row["env_json"]) if row["env_json"] else {},
+            "models": [
+                {
+                    "family": m["family"],
+                    "model": m["model_key"],
+                    "params": json.loads(m["params_json"]),
+                    "metrics": json.loads(m["metrics_json"]) if m["metrics_json"] else None,
+                    "timings": json.loads(m["timings_json"]) if m["timings_json"] else None,
+                    "error": m["error"],
+                }
+                for m in models
+            ],
+        }
@@ -0,0 +1,106 @@
+# backend/core/singleflight.py
+"""
+In-flight deduplication: while a call for some key is running, later calls with
+the same key wait for it and share its result (or exception) instead of
+repeating the work. Nothing is kept once the leader finishes.
+"""
+from __future__ import annotations
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+import numpy as np
+
+from core.cache import array_fingerprint
+from core.runstore import canonical_json
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Thread-based group (runners execute on pool threads)."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._leaders = 0
+        self._hits = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Returns (result, shared); shared is True when another caller did the work."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._leaders += 1
+            else:
+                self._hits += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"leaders": self._leaders, "hits": self._hits, "inflight": len(self._calls)}
+
+
+class AsyncSingleFlight:
+    """Event-loop group (request handlers); all access happens on the loop thread."""
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._leaders = 0
+        self._hits = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        task = self._calls.get(key)
+        shared = task is not None
+        if shared:
+            self._hits += 1
+        else:
+            # own task + shield: a disconnecting caller (leader included) never cancels shared work
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self._leaders += 1
+            task.add_done_callback(lambda _t: self._calls.pop(key, None))
+        return await asyncio.shield(task), shared
+
+    def stats(self) -> Dict[str, int]:
+        return {"leaders": self._leaders, "hits": self._hits, "inflight": len(self._calls)}
+
+
+def runner_key(family: str, model: str, Xtr: np.ndarray, ytr: np.ndarray, Xte: np.ndarray,
+               params: Dict, classes) -> Tuple[str, ...]:
+    return (family, model, array_fingerprint(Xtr, ytr, Xte), canonical_json(params), canonical_json(list(classes)))
+
+
+def coalesced(group: SingleFlight, family: str, model: str, runner: Callable) -> Callable:
+    """Wrap a registry Runner so identical concurrent calls train once."""
+    def _run(Xtr, ytr, Xte, params, classes):
+        key = runner_key(family, model, Xtr, ytr, Xte, params, classes)
+        (proba, timings, extras), shared = group.do(key, lambda: runner(Xtr, ytr, Xte, params, classes))
+        # callers get their own dicts; proba is shared read-only
+        extras = dict(extras or {})
+        if shared:
+            extras["coalesced"] = True
+            extras.pop("admission", None)  # the leader's slot ticket; this caller took no slot
+        return proba, dict(timings or {}), extras
+    return _run
@@ -0,0 +1,100 @@
+# backend/core/statevector.py
+"""
+Minimal batched statevector simulator (numpy only).
+
+States have shape (batch, 2, 2, ..., 2); axis q+1 is wire q, with wire 0 the
+most significant bit, matching PennyLane's ordering.
+"""
+from __future__ import annotations
+import numpy as np
+
+
+def zero_state(batch: int, n_qubits: int, dtype=np.complex128) -> np.ndarray:
+    state = np.zeros((batch,) + (2,) * n_qubits, dtype=dtype)
+    state[(slice(None),) + (0,) * n_qubits] = 1.0
+    return state
+
+
+def ry_matrices(angles: np.ndarray) -> np.ndarray:
+    """(batch,) angles -> (batch, 2, 2) real RY matrices."""
+    c, s = np.cos(angles / 2.0), np.sin(angles / 2.0)
+    return np.stack([np.stack([c, -s], -1), np.stack([s, c], -1)], -2)
+
+
+def rot_matrix(phi: float, theta: float, omega: float) -> np.ndarray:
+    """qml.Rot(phi, theta, omega) = RZ(omega) RY(theta) RZ(phi)."""
+    c, s = np.cos(theta / 2.0), np.sin(theta / 2.0)
+    return np.array([
+        [np.exp(-0.5j * (phi + omega)) * c, -np.exp(0.5j * (phi - omega)) * s],
+        [np.exp(-0.5j * (phi - omega)) * s, np.exp(0.5j * (phi + omega)) * c],
+    ])
+
+
+def _split(state: np.ndarray, q: int) -> np.ndarray:
+    """View as (batch, 2^q, 2, rest) so wire q's |0>/|1> halves are contiguous blocks."""
+    return np.ascontiguousarray(state).reshape(state.shape[0], 2 ** q, 2, -1)
+
+
+def apply_1q(state: np.ndarray, U: np.ndarray, q: int) -> np.ndarray:
+    """Apply a shared (2, 2) or per-row (batch, 2, 2) gate on wire q."""
+    if U.ndim == 2 and U[0, 1] == 0 and U[1, 0] == 0:
+        return apply_diag(state, U[0, 0], U[1, 1], q)
+    if U.ndim == 3:
+        U = np.moveaxis(U, 0, -1).reshape(2, 2, -1, 1, 1)  # entries broadcast per row
+    v = _split(state, q)
+    out = np.empty(v.shape, dtype=np.result_type(state, U))
+    a, b = v[:, :, 0], v[:, :, 1]
+    for r in (0, 1):
+        o = out[:, :, r]
+        np.multiply(a, U[r, 0], out=o)
+        o += b * U[r, 1]
+    return out.reshape(state.shape)
+
+
+def apply_diag(state: np.ndarray, d0, d1, q: int) -> np.ndarray:
+    """diag(d0, d1) on wire q (RZ, Z, phases)."""
+    return (_split(state, q) * np.array([d0, d1]).reshape(1, 1, 2, 1)).reshape(state.shape)
+
+
+def apply_paulis(state: np.ndarray, codes: np.ndarray, q: int) -> np.ndarray:
+    """Per-row Pauli on wire q; codes (batch,) with 0=I, 1=X, 2=Y, 3=Z, using Y = iXZ."""
+    v = _split(state, q)
+    rows = (-1, 1, 1)
+    z = ((codes == 2) | (codes == 3)).reshape(rows)
+    flip = ((codes == 1) | (codes == 2)).reshape(rows)
+    y = (codes == 2).reshape(rows)
+    a = v[:, :, 0]
+    b = np.where(z, -v[:, :, 1], v[:, :, 1])
+    out = np.empty_like(v)
+    out[:, :, 0] = np.where(flip, b, a)
+    out[:, :, 1] = np.where(flip, a, b)
+    out[y[:, 0, 0]] *= 1j
+    return out.reshape(state.shape)
+
+
+def apply_cnot(state: np.ndarray, control: int, target: int) -> np.ndarray:
+    idx = [slice(None)] * state.ndim
+    idx[control + 1] = 1
+    idx = tuple(idx)
+    # the control axis is dropped by the index, so later axes shift left by one
+    t_axis = target + 1 if target < control else target
+    out = state.copy()
+    out[idx] = np.flip(state[idx], axis=t_axis)
+    return out
+
+
+def apply_cnot_chain(state: np.ndarray, n_qubits: int) -> np.ndarray:
+    for q in range(n_qubits - 1):
+        state = apply_cnot(state, q, q + 1)
+    return state
+
+
+def expval_z(state: np.ndarray, q: int) -> np.ndarray:
+    """<Z_q> per row."""
+    probs = np.abs(_split(state, q)) ** 2
+    marg = probs.sum(axis=(1, 3))
+    return marg[:, 0] - marg[:, 1]
+
+
+def flatten(state: np.ndarray) -> np.ndarray:
+    return state.reshape(state.shape[0], -1)
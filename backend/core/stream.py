@@ -0,0 +1,188 @@
+# backend/core/stream.py
+"""
+Out-of-core counterpart of core.data: the same cleaning, split and scaling, but
+computed chunk by chunk over a file on disk, so memory is bounded by the chunk
+size instead of the dataset size.
+
+Differences from prepare_data_from_df, all forced by never holding every row:
+  - the train/test split is a seeded per-row coin flip (not stratified);
+  - feature columns and the target are chosen from the first chunk;
+  - only integer columns with all-unique values count as IDs (float features of a
+    100k-row chunk are nearly always unique);
+  - metrics use a uniform sample of at most `max_eval_rows` test rows.
+"""
+from __future__ import annotations
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from core.data import _infer_target_column, _norm
+from core.formats import Source, iter_table
+
+DEFAULT_CHUNK_ROWS = int(os.environ.get("QML_STREAM_CHUNK_ROWS", 100_000))
+MAX_EVAL_ROWS = int(os.environ.get("QML_STREAM_EVAL_ROWS", 200_000))
+
+
+def _factorize_labels(y: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (codes, label strings): only the distinct values are stringified. Strings are stable
+    across chunks, e.g. an int column read as float in one chunk still gives '1', not '1.0'.
+    """
+    codes, uniques = pd.factorize(y)
+    uniques = pd.Series(uniques)
+    if pd.api.types.is_float_dtype(uniques) and np.all(np.mod(uniques.to_numpy(), 1) == 0):
+        uniques = uniques.astype(np.int64)
+    return codes, uniques.astype(str).to_numpy(dtype=object)
+
+
+def _sorted_classes(counts: Counter, numeric: bool) -> List[str]:
+    # LabelEncoder order: numeric labels sort by value, others lexically
+    return sorted(counts, key=float) if numeric else sorted(counts)
+
+
+@dataclass
+class StreamDataset:
+    """Schema and scaler from the scan pass; every later pass re-reads `source`."""
+    source: Source
+    filename: Optional[str]
+    chunk_rows: int
+    target: str
+    features: List[str]
+    classes: List[str]
+    scaler: StandardScaler
+    class_counts: Dict[str, int]
+    n_train: int = 0
+    n_test: int = 0
+    n_dropped: int = 0
+    test_size: float = 0.2
+    seed: int = 7
+    target_note: str = ""
+    scan_ms: float = 0.0
+    eval_X: np.ndarray = field(default=None, repr=False)   # raw (unscaled) sample of test rows
+    eval_y: np.ndarray = field(default=None, repr=False)
+
+    def batches(self, part: str = "train", shuffle_seed: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Scaled (X, class index) blocks of one split, one per file chunk."""
+        want_test = part == "test"
+        index = {c: k for k, c in enumerate(self.classes)}
+        for i, df in enumerate(iter_table(self.source, self.filename, chunk_rows=self.chunk_rows)):
+            X, codes, labels, is_test = _clean_chunk(self, i, df)
+            sel = is_test if want_test else ~is_test
+            if not sel.any():
+                continue
+            lut = np.array([index.get(lab, -1) for lab in labels], dtype=np.int64)
+            X, y = X[sel], lut[codes[sel]]
+            if shuffle_seed is not None:
+                order = np.random.default_rng([shuffle_seed, i]).permutation(len(y))
+                X, y = X[order], y[order]
+            known = y >= 0
+            yield self.scaler.transform(X[known]), y[known].astype(np.int64)
+
+    def eval_split(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.scaler.transform(self.eval_X), self.eval_y
+
+    def info(self) -> Dict[str, Any]:
+        """Same keys as dataset_info from prepare_data_from_df, plus the streaming specifics."""
+        return {
+            "target": self.target,
+            "n_samples": self.n_train + self.n_test,
+            "n_features": len(self.features),
+            "features": list(self.features),
+            "classes": list(self.classes),
+            "class_counts": dict(self.class_counts),
+            "n_train": self.n_train,
+            "n_test": self.n_test,
+            "n_eval": int(len(self.eval_y)),
+            "n_dropped": self.n_dropped,
+            "chunk_rows": self.chunk_rows,
+        }
+
+
+def _clean_chunk(ds: StreamDataset, i: int, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(X raw, label codes, label strings, is_test) for the rows of chunk `i` that survive cleaning."""
+    # drawn before dropping rows, so every pass splits identically
+    is_test = np.random.default_rng([ds.seed, i]).random(len(df)) < ds.test_size
+    feats = df.reindex(columns=ds.features)
+    odd = [c for c in ds.features if not pd.api.types.is_numeric_dtype(feats[c])]
+    if odd:  # e.g. a CSV chunk where a stray token made a numeric column object-typed
+        feats[odd] = feats[odd].apply(pd.to_numeric, errors="coerce")
+    X = feats.to_numpy(dtype=float)
+    y = df[ds.target] if ds.target in df.columns else pd.Series(np.nan, index=df.index)
+    keep = ~(np.isnan(X).any(axis=1) | y.isna().to_numpy())
+    codes, labels = _factorize_labels(y[keep])
+    return X[keep], codes, labels, is_test[keep]
+
+
+def _select_features(df: pd.DataFrame, target: str) -> List[str]:
+    feats = []
+    for c in df.columns:
+        if c == target or _norm(str(c)) in {"id", "index"} or not pd.api.types.is_numeric_dtype(df[c]):
+            continue
+        if pd.api.types.is_integer_dtype(df[c]) and len(df) > 1 and df[c].nunique() == len(df):
+            continue
+        feats.append(c)
+    return feats
+
+
+def scan_dataset(source: Source, target_col_requested: Optional[str], filename: Optional[str] = None,
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS, max_eval_rows: int = MAX_EVAL_ROWS,
+                 test_size: float = 0.2, seed: int = 7) -> StreamDataset:
+    """
+    First pass over the file: schema, label set and counts, scaler statistics on the
+    train rows, and a uniform sample of test rows for evaluation.
+    """
+    t0 = time.perf_counter()
+    chunks = iter_table(source, filename, chunk_rows=chunk_rows)
+    first = next(chunks, None)
+    if first is None or len(first) == 0:
+        raise ValueError("Dataset is empty.")
+    target, note = _infer_target_column(first, target_col_requested)
+    features = _select_features(first, target)
+    if not features:
+        raise ValueError("No numeric feature columns remain after cleaning.")
+    numeric_labels = pd.api.types.is_numeric_dtype(first[target])
+    del first, chunks
+
+    ds = StreamDataset(source, filename, int(chunk_rows), target, features, [], StandardScaler(), {},
+                       test_size=test_size, seed=seed, target_note=note)
+    counts: Counter = Counter()
+    rng = np.random.default_rng(seed)
+    # bottom-k by random key over all test rows == uniform sample without replacement
+    keys = np.empty(0)
+    sample_X = np.empty((0, len(features)))
+    sample_y = np.empty(0, dtype=object)
+    rows_seen = 0
+    for i, df in enumerate(iter_table(source, filename, chunk_rows=chunk_rows)):
+        rows_seen += len(df)
+        X, codes, labels, is_test = _clean_chunk(ds, i, df)
+        counts.update(dict(zip(labels.tolist(), np.bincount(codes, minlength=len(labels)).tolist())))
+        if (~is_test).any():
+            ds.scaler.partial_fit(X[~is_test])
+        ds.n_train += int((~is_test).sum())
+        ds.n_test += int(is_test.sum())
+        if is_test.any():
+            keys = np.concatenate([keys, rng.random(int(is_test.sum()))])
+            sample_X = np.concatenate([sample_X, X[is_test]])
+            sample_y = np.concatenate([sample_y, labels[codes[is_test]]])
+            if len(keys) > max_eval_rows:
+                top = np.argpartition(keys, max_eval_rows)[:max_eval_rows]
+                keys, sample_X, sample_y = keys[top], sample_X[top], sample_y[top]
+    if ds.n_train == 0 or ds.n_test == 0:
+        raise ValueError("Not enough rows to split into train and test.")
+    if len(counts) < 2:
+        raise ValueError(f"Need at least 2 classes in '{target}', found {len(counts)}.")
+
+    ds.n_dropped = rows_seen - ds.n_train - ds.n_test
+    ds.classes = _sorted_classes(counts, numeric_labels)
+    ds.class_counts = {c: int(counts[c]) for c in ds.classes}
+    ds.eval_X = sample_X
+    ds.eval_y = pd.Categorical(sample_y, categories=ds.classes).codes.astype(np.int64)
+    ds.scan_ms = (time.perf_counter() - t0) * 1000.0
+    return ds
+
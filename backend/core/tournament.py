@@ -0,0 +1,121 @@
+# backend/core/tournament.py
+from __future__ import annotations
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import numpy as np
+
+from core.estimate import BudgetExceeded
+from core.metrics import metrics_from_probs, details_from_preds
+from core.registry import get_classical_runner, get_quantum_runner
+
+_RESOLVERS = {
+    "classical": get_classical_runner,
+    "quantum": get_quantum_runner,
+}
+
+
+def default_max_workers() -> int:
+    """Server-side cap on concurrent runners per tournament (QML_TOURNAMENT_MAX_WORKERS)."""
+    env = os.environ.get("QML_TOURNAMENT_MAX_WORKERS")
+    if env:
+        return max(1, int(env))
+    return max(1, min(4, (os.cpu_count() or 2) // 2))
+
+
+def _local_runner(family: str, model: str):
+    return _RESOLVERS[family](model)
+
+
+def _run_entry(entry: Dict[str, Any], submitted: float, X_tr, y_tr, X_te, y_te, classes,
+               resolve: Callable) -> Dict[str, Any]:
+    started = time.perf_counter()
+    out: Dict[str, Any] = {
+        "family": entry["family"],
+        "model": entry["model"],
+        "params": entry["params"],
+        "queue_wait_ms": (started - submitted) * 1000.0,
+    }
+    if "estimate" in entry:
+        out["estimate"] = entry["estimate"]
+    try:
+        if entry.get("refused"):
+            raise BudgetExceeded(entry["refused"])
+        runner = resolve(entry["family"], entry["model"])
+        proba, timings, extras = runner(X_tr, y_tr, X_te, entry["params"], classes)
+        wall_ms = (time.perf_counter() - started) * 1000.0
+        out["metrics"] = metrics_from_probs(y_te, proba) | {"latency_ms": wall_ms}
+        out["details"] = details_from_preds(y_te, proba, classes, timings=timings, extras=extras)
+        out["proba"] = proba
+    except Exception as e:
+        out["error"] = f"{type(e).__name__}: {e}"
+    out["wall_ms"] = (time.perf_counter() - started) * 1000.0
+    return out
+
+
+def _rank_key(row: Dict[str, Any]):
+    m = row.get("metrics")
+    if not m:
+        return (1, 0.0, 0.0)
+    f1 = m["f1"] if np.isfinite(m["f1"]) else 0.0
+    return (0, -m["accuracy"], -f1)
+
+
+def run_tournament(
+    entries: List[Dict[str, Any]],
+    X_tr: np.ndarray, y_tr: np.ndarray, X_te: np.ndarray, y_te: np.ndarray,
+    classes: List[str],
+    max_workers: Optional[int] = None,
+    resolve: Optional[Callable] = None,
+    family_limits: Optional[Dict[str, int]] = None,
+) -> Dict[str, Any]:
+    """
+    Run every (family, model, params) entry on one prepared split.
+    At most `max_workers` runners execute at once (never more than default_max_workers(),
+    whatever the client asks for), and at most `family_limits[family]` of one family
+    (the admission gate limits), so entries never queue in a gate behind their own
+    siblings; the rest wait here, in submission order per family.
+    Failed entries stay on the leaderboard with an `error` and rank last.
+    `resolve(family, model)` returns the runner (defaults to the local registry).
+    """
+    resolve = resolve or _local_runner
+    cap = default_max_workers()
+    workers = max(1, min(int(max_workers or cap), cap))
+    limits = family_limits or {}
+    pending: Dict[str, Deque[int]] = {}
+    for i, e in enumerate(entries):
+        pending.setdefault(e["family"], deque()).append(i)
+    running: Dict[str, int] = {f: 0 for f in pending}
+    results: List[Optional[Dict[str, Any]]] = [None] * len(entries)
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tournament") as pool:
+        inflight: Dict[Any, int] = {}
+        while pending or inflight:
+            # fill free workers, rotating over families so one cannot starve another
+            progress = True
+            while progress and len(inflight) < workers:
+                progress = False
+                for family in list(pending):
+                    if len(inflight) >= workers or running[family] >= limits.get(family, workers):
+                        continue
+                    i = pending[family].popleft()
+                    if not pending[family]:
+                        del pending[family]
+                    running[family] += 1
+                    fut = pool.submit(_run_entry, entries[i], t0, X_tr, y_tr, X_te, y_te, classes, resolve)
+                    inflight[fut] = i
+                    progress = True
+            done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                i = inflight.pop(fut)
+                running[entries[i]["family"]] -= 1
+                results[i] = fut.result()
+    total_ms = (time.perf_counter() - t0) * 1000.0
+
+    leaderboard = sorted(results, key=_rank_key)
+    for rank, row in enumerate(leaderboard, start=1):
+        row["rank"] = rank
+    return {"leaderboard": leaderboard, "total_ms": total_ms, "max_workers": workers}
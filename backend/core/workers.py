@@ -0,0 +1,273 @@
+# backend/core/workers.py
+"""
+Offload registry runners to standalone worker processes (see backend/worker.py).
+
+Wire format: one .npz body per direction (no pickle). Jobs carry Xtr/ytr/Xte
+plus a JSON "meta" blob (family, model, params, classes); results carry proba
+plus JSON timings/extras, i.e. the same (proba, timings, extras) a local runner
+returns.
+"""
+from __future__ import annotations
+import http.client
+import io
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+
+
+class WorkerLost(Exception):
+    """Transport-level failure: the job may be retried on another worker."""
+
+
+class RemoteRunnerError(RuntimeError):
+    """The runner itself raised on the worker; retrying elsewhere would not help."""
+
+
+class JobTimeout(RuntimeError):
+    """
+    The worker accepted the job but did not answer within job_timeout. It may still be
+    running it, so the job is not sent anywhere else and the worker is not marked lost.
+    """
+
+
+def _auth_headers() -> Dict[str, str]:
+    token = os.environ.get("QML_WORKER_TOKEN")
+    return {"Authorization": f"Bearer {token}"} if token else {}
+
+
+# ---------------------------
+# Serialization
+# ---------------------------
+def _json_default(o):
+    if hasattr(o, "tolist"):
+        return o.tolist()
+    return str(o)
+
+def _pack(arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> bytes:
+    buf = io.BytesIO()
+    blob = np.frombuffer(json.dumps(meta, default=_json_default).encode(), dtype=np.uint8)
+    np.savez(buf, __meta__=blob, **arrays)
+    return buf.getvalue()
+
+def _unpack(body: bytes) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    with np.load(io.BytesIO(body), allow_pickle=False) as z:
+        meta = json.loads(z["__meta__"].tobytes().decode())
+        arrays = {k: z[k] for k in z.files if k != "__meta__"}
+    return arrays, meta
+
+def encode_job(family: str, model: str, Xtr, ytr, Xte, params: Dict, classes: List[str]) -> bytes:
+    return _pack({"Xtr": np.asarray(Xtr), "ytr": np.asarray(ytr), "Xte": np.asarray(Xte)},
+                 {"family": family, "model": model, "params": params, "classes": list(classes)})
+
+def decode_job(body: bytes):
+    a, m = _unpack(body)
+    return m["family"], m["model"], a["Xtr"], a["ytr"], a["Xte"], m["params"], m["classes"]
+
+def encode_result(proba, timings: Dict, extras: Dict) -> bytes:
+    return _pack({"proba": np.asarray(proba, dtype=float)}, {"timings": timings or {}, "extras": extras or {}})
+
+def decode_result(body: bytes) -> Tuple[np.ndarray, Dict, Dict]:
+    a, m = _unpack(body)
+    return a["proba"], m["timings"], m["extras"]
+
+
+# ---------------------------
+# Client-side pool
+# ---------------------------
+class _Worker:
+    def __init__(self, url: str):
+        u = urlparse(url if "://" in url else f"http://{url}")
+        self.url = f"http://{u.hostname}:{u.port or 80}"
+        self.host, self.port = u.hostname, u.port or 80
+        self.healthy = True
+        self.inflight = 0          # jobs this API process has on the worker
+        self.remote_inflight = 0   # last load the worker reported (all clients)
+        self.failures = 0
+        self.last_seen: Optional[float] = None
+
+    def load(self) -> int:
+        return max(self.inflight, self.remote_inflight)
+
+    def request(self, method: str, path: str, body: Optional[bytes] = None, timeout: float = 5.0,
+                connect_timeout: float = 5.0):
+        """
+        Connection failures (refused, unreachable, connect timeout) raise OSError; once
+        connected, running past `timeout` raises JobTimeout.
+        """
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=min(timeout, connect_timeout))
+        try:
+            conn.connect()
+            conn.sock.settimeout(timeout)
+            headers = _auth_headers()
+            if body is not None:
+                headers["Content-Type"] = "application/octet-stream"
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                return resp.status, resp.read()
+            except TimeoutError as e:
+                raise JobTimeout(f"{self.url} did not answer {method} {path} within {timeout:g}s") from e
+        finally:
+            conn.close()
+
+
+class WorkerPool:
+    """
+    Least-loaded dispatch over a fixed list of worker URLs.
+    A background thread polls /health; a job whose worker drops (connection refused or
+    reset) is retried on another healthy worker up to `max_retries` times. A job that
+    runs past `job_timeout` fails with JobTimeout and is not retried.
+    """
+    def __init__(self, urls: List[str], job_timeout: float = 3600.0,
+                 health_interval: float = 5.0, max_retries: int = 2):
+        if not urls:
+            raise ValueError("WorkerPool needs at least one worker URL.")
+        self.workers = [_Worker(u) for u in urls]
+        self.job_timeout = job_timeout
+        self.health_interval = health_interval
+        self.max_retries = max_retries
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._monitor = threading.Thread(target=self._health_loop, name="worker-health", daemon=True)
+        self._monitor.start()
+
+    @classmethod
+    def from_env(cls) -> Optional["WorkerPool"]:
+        """QML_WORKERS="host:port,host:port" enables remote execution."""
+        raw = os.environ.get("QML_WORKERS", "").strip()
+        if not raw:
+            return None
+        return cls(
+            [u.strip() for u in raw.split(",") if u.strip()],
+            job_timeout=float(os.environ.get("QML_WORKER_TIMEOUT", 3600)),
+            max_retries=int(os.environ.get("QML_WORKER_RETRIES", 2)),
+        )
+
+    # ---- health ----
+    def check(self, w: _Worker) -> bool:
+        try:
+            status, body = w.request("GET", "/health", timeout=2.0)
+            info = json.loads(body) if status == 200 else {}
+            ok = bool(info.get("ok"))
+        except Exception:
+            ok, info = False, {}
+        with self._lock:
+            w.healthy = ok
+            if ok:
+                w.failures = 0
+                w.last_seen = time.time()
+                w.remote_inflight = int(info.get("inflight", 0))
+        return ok
+
+    def _health_loop(self):
+        while not self._stop.wait(self.health_interval):
+            for w in self.workers:
+                self.check(w)
+
+    def status(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {"url": w.url, "healthy": w.healthy, "inflight": w.inflight,
+                 "remote_inflight": w.remote_inflight, "failures": w.failures, "last_seen": w.last_seen}
+                for w in self.workers
+            ]
+
+    # ---- dispatch ----
+    def _acquire(self, exclude: set) -> _Worker:
+        with self._lock:
+            candidates = [w for w in self.workers if w.healthy and w.url not in exclude]
+            if not candidates:
+                # nobody looks healthy: give the untried ones a chance before failing
+                candidates = [w for w in self.workers if w.url not in exclude]
+            if not candidates:
+                raise WorkerLost("no workers available")
+            w = min(candidates, key=lambda c: (c.load(), c.failures))
+            w.inflight += 1
+            return w
+
+    def _release(self, w: _Worker, lost: bool):
+        with self._lock:
+            w.inflight -= 1
+            if lost:
+                w.healthy = False
+                w.failures += 1
+
+    def run(self, family: str, model: str, Xtr, ytr, Xte, params: Dict, classes: List[str]):
+        body = encode_job(family, model, Xtr, ytr, Xte, params, classes)
+        tried: set = set()
+        last_err: Optional[Exception] = None
+        for _ in range(self.max_retries + 1):
+            try:
+                w = self._acquire(tried)
+            except WorkerLost as e:
+                last_err = e
+                break
+            tried.add(w.url)
+            lost = False
+            try:
+                status, payload = w.request("POST", "/run", body=body, timeout=self.job_timeout)
+                if status == 200:
+                    return decode_result(payload)
+                if status in (400, 422):
+                    raise RemoteRunnerError(json.loads(payload).get("error", "remote runner failed"))
+                if status == 401:
+                    raise RemoteRunnerError(f"{w.url} rejected the job: QML_WORKER_TOKEN does not match")
+                lost = True
+                last_err = WorkerLost(f"{w.url} answered HTTP {status}")
+            except JobTimeout:
+                raise  # still running over there: a second copy elsewhere would only double the load
+            except (OSError, http.client.HTTPException) as e:
+                lost = True
+                last_err = WorkerLost(f"{w.url}: {e}")
+            finally:
+                self._release(w, lost)
+        raise RuntimeError(f"No worker completed the job ({last_err})")
+
+    def runner(self, family: str, model: str):
+        """A registry-compatible Runner that executes on the pool."""
+        def _run(Xtr, ytr, Xte, params, classes):
+            return self.run(family, model, Xtr, ytr, Xte, params, classes)
+        return _run
+
+    def close(self):
+        self._stop.set()
+
+
+# ---------------------------
+# Local worker processes (dev / tests)
+# ---------------------------
+def spawn_local_workers(n: int, base_port: int = 9101, host: str = "127.0.0.1",
+                        slots: int = 1, wait_s: float = 30.0) -> Tuple[List[subprocess.Popen], List[str]]:
+    """Start n `worker.py` processes on consecutive ports and wait until they answer /health."""
+    script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "worker.py")
+    procs, urls = [], []
+    for i in range(n):
+        port = base_port + i
+        procs.append(subprocess.Popen(
+            [sys.executable, script, "--host", host, "--port", str(port), "--slots", str(slots)],
+            cwd=os.path.dirname(script),
+        ))
+        urls.append(f"http://{host}:{port}")
+    deadline = time.time() + wait_s
+    for url in urls:
+        w = _Worker(url)
+        while True:
+            try:
+                status, _ = w.request("GET", "/health", timeout=1.0)
+                if status == 200:
+                    break
+            except OSError:
+                pass
+            if time.time() > deadline:
+                for p in procs:
+                    p.terminate()
+                raise RuntimeError(f"worker {url} did not come up within {wait_s}s")
+            time.sleep(0.2)
+    return procs, urls
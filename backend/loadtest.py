@@ -0,0 +1,293 @@
+# backend/loadtest.py
+"""
+Service-level load generator for the QML Compare API.
+
+    # drive the app in-process (no server needed)
+    python loadtest.py --concurrency 8 --requests 200 --mix preview=5,quickcheck=3,compare=1
+
+    # against a running uvicorn
+    python loadtest.py --url http://127.0.0.1:8000 --duration 60 --out report.json
+
+    # compare with a previous report
+    python loadtest.py --requests 200 --baseline report.json
+
+Reports throughput, p50/p95/p99 latency and error rate per endpoint, event-loop
+lag (of the app's loop in-process, of the client loop otherwise) and /api/health
+probe latency, as JSON.
+
+In-process mode runs the app's startup/shutdown hooks, keeps runs in a throwaway
+SQLite file and skips estimator calibration; only --url mode measures a deployed
+server (its workers, its uvicorn loop). Every compare/tournament request carries a
+distinct `loadtest_seq` param so identical requests are not coalesced into one
+run; pass --coalesce to send them unchanged.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+ENDPOINTS = ("preview", "quickcheck", "compare", "tournament")
+
+
+# ---------------------------
+# Inputs
+# ---------------------------
+def make_dataset(rows: int, features: int, classes: int, seed: int = 7) -> bytes:
+    """Synthetic, learnable CSV (values rounded so feature columns are not mistaken for ids)."""
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, classes, size=rows)
+    centers = rng.normal(scale=2.0, size=(classes, features))
+    X = (centers[y] + rng.normal(size=(rows, features))).round(1)
+    df = pd.DataFrame(X, columns=[f"f{i}" for i in range(features)])
+    df["label"] = [f"c{v}" for v in y]
+    return df.to_csv(index=False).encode()
+
+def parse_mix(raw: str) -> Tuple[List[str], np.ndarray]:
+    names, weights = [], []
+    for part in raw.split(","):
+        name, _, w = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise SystemExit(f"unknown endpoint '{name}' in --mix (choose from {ENDPOINTS})")
+        names.append(name)
+        weights.append(float(w or 1))
+    p = np.asarray(weights, dtype=float)
+    return names, p / p.sum()
+
+def build_request(name: str, data: bytes, args, seq: int = 0) -> Tuple[str, Dict[str, Any]]:
+    """`seq` tags runner params (ignored by the runners) so the server cannot coalesce requests."""
+    files = {"file": ("loadtest.csv", data, "text/csv")}
+    if name == "preview":
+        return "/api/preview", {"files": files}
+    if name == "quickcheck":
+        return "/api/quickcheck", {"files": files, "data": {"target": "label"}}
+    tag = {} if args.coalesce else {"loadtest_seq": seq}
+    cparams = json.loads(args.classical_params) | tag
+    qparams = json.loads(args.quantum_params) | tag
+    if name == "compare":
+        return "/api/compare", {"files": files, "data": {
+            "classicalModel": args.classical, "quantumModel": args.quantum,
+            "classicalParams": json.dumps(cparams), "quantumParams": json.dumps(qparams),
+            "targetColumn": "label",
+        }}
+    return "/api/tournament", {"files": files, "data": {
+        "classicalModels": json.dumps([args.classical]), "quantumModels": json.dumps([args.quantum]),
+        "classicalParams": json.dumps({args.classical: cparams}),
+        "quantumParams": json.dumps({args.quantum: qparams}),
+        "targetColumn": "label",
+    }}
+
+
+# ---------------------------
+# Stats
+# ---------------------------
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"count": 0, "mean": None, "p50": None, "p95": None, "p99": None, "max": None}
+    a = np.asarray(values, dtype=float)
+    return {
+        "count": int(a.size),
+        "mean": float(a.mean()),
+        "p50": float(np.percentile(a, 50)),
+        "p95": float(np.percentile(a, 95)),
+        "p99": float(np.percentile(a, 99)),
+        "max": float(a.max()),
+    }
+
+def diff_reports(new: Dict[str, Any], old: Dict[str, Any]) -> Dict[str, Any]:
+    """Relative change (new/old - 1) for throughput and per-endpoint latency percentiles."""
+    def rel(a, b):
+        return None if a is None or not b else a / b - 1.0
+    out: Dict[str, Any] = {"throughput_rps": rel(new["totals"]["throughput_rps"], old["totals"]["throughput_rps"])}
+    for name, cur in new["endpoints"].items():
+        prev = old.get("endpoints", {}).get(name)
+        if not prev:
+            continue
+        out[name] = {k: rel(cur["latency_ms"][k], prev["latency_ms"][k]) for k in ("p50", "p95", "p99")}
+        out[name]["error_rate"] = cur["error_rate"] - prev["error_rate"]
+    return out
+
+
+# ---------------------------
+# Driver
+# ---------------------------
+async def _lag_monitor(stop: asyncio.Event, interval: float, out: List[float]):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        t = loop.time()
+        await asyncio.sleep(interval)
+        out.append(max(0.0, (loop.time() - t - interval) * 1000.0))
+
+async def _health_probe(client, stop: asyncio.Event, interval: float, out: List[float]):
+    while not stop.is_set():
+        t = time.perf_counter()
+        try:
+            await client.get("/api/health")
+            out.append((time.perf_counter() - t) * 1000.0)
+        except Exception:
+            pass
+        await asyncio.sleep(interval)
+
+async def run_load(args) -> Dict[str, Any]:
+    try:
+        import httpx
+    except Exception as e:
+        raise SystemExit(f"loadtest requires httpx. Install: pip install httpx ({e})")
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+        return await _drive(args, client, None)
+
+    with tempfile.TemporaryDirectory(prefix="qml-loadtest-") as tmp:
+        # set before main is imported: keep runs out of the real store, no startup benchmark
+        os.environ["QML_RUNSTORE_PATH"] = os.path.join(tmp, "runs.sqlite3")
+        os.environ["QML_ESTIMATE_CALIBRATE"] = "0"
+        from main import app
+        # ASGITransport sends no lifespan events; run the startup/shutdown hooks ourselves
+        async with app.router.lifespan_context(app):
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                       base_url="http://loadtest", timeout=args.timeout)
+            return await _drive(args, client, app.version)
+
+async def _drive(args, client, app_version: Optional[str]) -> Dict[str, Any]:
+    names, probs = parse_mix(args.mix)
+    datasets = {rows: make_dataset(rows, args.features, args.classes) for rows in args.rows}
+    rng = np.random.default_rng(args.seed)
+
+    results: Dict[str, Dict[str, Any]] = {n: {"lat": [], "status": {}, "errors": 0} for n in names}
+    lag: List[float] = []
+    probe: List[float] = []
+    stop = asyncio.Event()
+    issued = 0
+    deadline = time.perf_counter() + args.duration if args.duration else None
+
+    async def worker():
+        nonlocal issued
+        while (not args.requests or issued < args.requests) and (deadline is None or time.perf_counter() < deadline):
+            issued += 1
+            # draws happen in issue order on one loop, so a seed reproduces the request sequence
+            name = names[rng.choice(len(names), p=probs)]
+            rows = args.rows[rng.integers(len(args.rows))]
+            path, kwargs = build_request(name, datasets[rows], args, seq=issued)
+            rec = results[name]
+            t = time.perf_counter()
+            try:
+                resp = await client.post(path, **kwargs)
+                code = str(resp.status_code)
+                if resp.status_code >= 400:
+                    rec["errors"] += 1
+            except Exception as e:
+                code = type(e).__name__
+                rec["errors"] += 1
+            rec["lat"].append((time.perf_counter() - t) * 1000.0)
+            rec["status"][code] = rec["status"].get(code, 0) + 1
+
+    monitors = [
+        asyncio.create_task(_lag_monitor(stop, args.lag_interval, lag)),
+        asyncio.create_task(_health_probe(client, stop, args.probe_interval, probe)),
+    ]
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await asyncio.gather(*monitors)
+    await client.aclose()
+
+    total = sum(len(r["lat"]) for r in results.values())
+    errors = sum(r["errors"] for r in results.values())
+    return {
+        "meta": {
+            "mode": "url" if args.url else "in-process",
+            "target": args.url or "main:app",
+            "app_version": app_version,
+            "python": platform.python_version(),
+            "started_at": time.time() - elapsed,
+            "config": {
+                "concurrency": args.concurrency, "requests": args.requests, "duration": args.duration,
+                "mix": args.mix, "rows": args.rows, "features": args.features, "classes": args.classes,
+                "classical": args.classical, "quantum": args.quantum,
+                "classical_params": json.loads(args.classical_params),
+                "quantum_params": json.loads(args.quantum_params), "seed": args.seed,
+                "coalesce": args.coalesce,
+            },
+        },
+        "totals": {
+            "requests": total,
+            "errors": errors,
+            "error_rate": errors / total if total else 0.0,
+            "duration_s": elapsed,
+            "throughput_rps": total / elapsed if elapsed else 0.0,
+        },
+        "endpoints": {
+            n: {
+                "count": len(r["lat"]),
+                "errors": r["errors"],
+                "error_rate": r["errors"] / len(r["lat"]) if r["lat"] else 0.0,
+                "status_counts": r["status"],
+                "throughput_rps": len(r["lat"]) / elapsed if elapsed else 0.0,
+                "latency_ms": summarize(r["lat"]),
+            }
+            for n, r in results.items()
+        },
+        "event_loop_lag_ms": summarize(lag),
+        "health_probe_ms": summarize(probe),
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Load-test the QML Compare API")
+    ap.add_argument("--url", default=None, help="base URL of a running server; omit to drive main:app in-process")
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--requests", type=int, default=100, help="total requests (0 = until --duration)")
+    ap.add_argument("--duration", type=float, default=0.0, help="stop after N seconds (0 = no limit)")
+    ap.add_argument("--mix", default="preview=5,quickcheck=3,compare=1")
+    ap.add_argument("--rows", type=int, nargs="+", default=[500], help="dataset sizes to rotate through")
+    ap.add_argument("--features", type=int, default=6)
+    ap.add_argument("--classes", type=int, default=3)
+    ap.add_argument("--classical", default="logreg")
+    ap.add_argument("--quantum", default="qsvm_kernel")
+    ap.add_argument("--classical-params", default="{}")
+    ap.add_argument("--quantum-params", default='{"n_qubits": 3}')
+    ap.add_argument("--timeout", type=float, default=600.0)
+    ap.add_argument("--lag-interval", type=float, default=0.05)
+    ap.add_argument("--probe-interval", type=float, default=0.5)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--coalesce", action="store_true",
+                    help="send identical compare/tournament requests unchanged, so the server may share runs")
+    ap.add_argument("--out", default=None, help="write the JSON report here (default: stdout)")
+    ap.add_argument("--baseline", default=None, help="previous report to diff against")
+    args = ap.parse_args(argv)
+    if not args.requests and not args.duration:
+        ap.error("set --requests or --duration")
+
+    # keep stdout clean for the JSON report (the app logs with print)
+    with contextlib.redirect_stdout(sys.stderr):
+        report = asyncio.run(run_load(args))
+    if args.baseline:
+        with open(args.baseline) as fh:
+            report["diff_vs_baseline"] = diff_reports(report, json.load(fh))
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        with open(args.out, "w") as fh:
+            fh.write(text + "\n")
+        t = report["totals"]
+        print(f"{t['requests']} requests, {t['throughput_rps']:.2f} req/s, "
+              f"error rate {t['error_rate']:.2%} -> {args.out}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
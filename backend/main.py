@@ -1,21 +1,34 @@
 # backend/main.py
 from __future__ import annotations
 
-import io
 import json
+import logging
+import os
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+import anyio
 import numpy as np  # noqa: F401
 import pandas as pd
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, ValidationError
 
+from core.admission import Admission, AdmissionRejected, admitted
 from core.quickcheck import DatasetAnalyzer, ModelSelector
-from core.data import prepare_data_from_csv
+from core.data import _infer_target_column, prepare_data_from_csv
+from core.estimate import COST_MODELS, Budget, BudgetExceeded, Estimator, Shape
+from core.formats import Source, read_table, spool_to_disk
 from core.metrics import metrics_from_probs, details_from_preds
 from core.registry import get_classical_runner, get_quantum_runner
+from core.runstore import RunStore, canonical_json
+from core.singleflight import AsyncSingleFlight, SingleFlight, coalesced
+from core.stream import DEFAULT_CHUNK_ROWS, scan_dataset
+from core.workers import WorkerPool
+from core.tournament import run_tournament
+from models.classical_stream import STREAM_MODELS, fit_stream, predict_stream
 
 
 app = FastAPI(title="QML Compare API", version="0.3.3")
@@ -30,26 +43,108 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
+# Every compare/tournament is logged here; writes happen on a background thread.
+# Opened by the startup hook, so importing this module touches no files.
+RUN_STORE: Optional[RunStore] = None
+
+# Optional remote execution: QML_WORKERS="host:port,..." sends runners to worker.py processes
+WORKER_POOL = WorkerPool.from_env()
+
+# Pre-run cost model; QML_BUDGET_* makes compare/tournament refuse or downscale oversized runs
+ESTIMATOR = Estimator()
+BUDGET = Budget.from_env()
+
+# Short-lived dedup of in-flight work: whole compare requests, and individual runner calls
+COMPARE_FLIGHT = AsyncSingleFlight()
+RUNNER_FLIGHT = SingleFlight()
+
+# Per-family concurrency limits and bounded wait queues for runner execution
+ADMISSION = Admission.from_env()
+
+log = logging.getLogger(__name__)
+
+# Spooled uploads whose removal failed (still memory-mapped); see _discard
+_PENDING_DISCARDS: List[str] = []
+_PENDING_LOCK = threading.Lock()
+
+@app.on_event("startup")
+def _open_run_store():
+    global RUN_STORE
+    if RUN_STORE is None:
+        RUN_STORE = RunStore(os.environ.get("QML_RUNSTORE_PATH",
+                                            os.path.join(os.path.dirname(__file__), "runs.sqlite3")))
+
+@app.on_event("startup")
+def _size_threadpool():
+    """Runners and queued runners each hold a threadpool thread; keep spare ones for light endpoints."""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = max(limiter.total_tokens, ADMISSION.threads_needed() + 16)
+
+@app.on_event("startup")
+def _calibrate_estimator():
+    """Benchmark unit costs and fit per-runner corrections from stored runs, off the request path."""
+    if os.environ.get("QML_ESTIMATE_CALIBRATE", "1") == "0":
+        return
+    def _run():
+        try:
+            ESTIMATOR.calibrate()
+            ESTIMATOR.calibrate_from_runs(RUN_STORE.list_runs(limit=500)["items"])
+        except Exception as e:
+            log.warning("estimate: calibration failed (%s)", e)
+    threading.Thread(target=_run, name="estimate-calibration", daemon=True).start()
+
+@app.on_event("shutdown")
+def _close_run_store():
+    global RUN_STORE
+    if RUN_STORE is not None:
+        RUN_STORE.close()
+        RUN_STORE = None
+    if WORKER_POOL is not None:
+        WORKER_POOL.close()
+    _discard()
+    for p in _PENDING_DISCARDS:
+        log.error("spooled upload %s could not be removed", p)
+
 # ---------------------------
 # Helpers
 # ---------------------------
-def _read_csv(content: bytes) -> pd.DataFrame:
-    """Robust CSV load: try common delimiters, require >= 2 columns."""
-    last_err: Optional[Exception] = None
-    for sep in (",", ";", "\t", "|"):
+def _read_csv(source: Source, filename: Optional[str] = None) -> pd.DataFrame:
+    """
+    Load an upload: CSV (delimiter sniffed, >= 2 columns) or Parquet/Feather/npy/npz by magic bytes.
+    Read into memory (no mapping): callers delete the spooled file while still using the frame.
+    """
+    return read_table(source, filename=filename, mmap=False)
+
+def _spool_upload(file: UploadFile) -> Tuple[str, str]:
+    """Spool the upload to a temp file so binary formats load via memory-mapping; returns (path, sha256)."""
+    file.file.seek(0)
+    return spool_to_disk(file.file, suffix=os.path.splitext(file.filename or "")[1])
+
+def _discard(path: Optional[str] = None) -> None:
+    """
+    Delete a spooled upload. A file that cannot be removed yet (on Windows, while a memory
+    map of it is still alive, e.g. referenced from an error traceback) is retried on later
+    calls and at shutdown.
+    """
+    with _PENDING_LOCK:
+        paths = _PENDING_DISCARDS[:] + ([path] if path else [])
+        _PENDING_DISCARDS.clear()
+    failed = []
+    for p in paths:
         try:
-            df = pd.read_csv(io.BytesIO(content), sep=sep)
-            if df.shape[1] >= 2:
-                return df
-        except Exception as e:
-            last_err = e
-            continue
-    if last_err:
-        # final attempt, let pandas raise how it wants
-        return pd.read_csv(io.BytesIO(content))
-    return pd.read_csv(io.BytesIO(content))
+            os.remove(p)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            if p == path:
+                log.warning("could not remove spooled upload %s yet (%s); will retry", p, e)
+            failed.append(p)
+    if failed:
+        with _PENDING_LOCK:
+            _PENDING_DISCARDS.extend(failed)
 
 def _parse_json_obj(name: str, raw: Optional[str]) -> Dict[str, Any]:
     """Parse a JSON object string safely; return {} if empty."""
@@ -63,6 +158,50 @@ def _parse_json_obj(name: str, raw: Optional[str]) -> Dict[str, Any]:
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"{name} is not valid JSON: {e}")
 
+def _parse_json_list(name: str, raw: Optional[str]) -> List[str]:
+    """Parse a JSON array of model keys; return [] if empty."""
+    if raw is None or raw == "":
+        return []
+    try:
+        val = json.loads(raw)
+        if isinstance(val, list) and all(isinstance(v, str) for v in val):
+            return val
+        raise ValueError("not a JSON array of strings")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"{name} is not valid JSON: {e}")
+
+def _resolve_runner(family: str, key: str):
+    """
+    Registry lookup (raises on unknown keys); dispatches to the worker pool when configured.
+    Every call waits for a slot of its family; concurrent calls with identical data and
+    params (from any compare or tournament) train once.
+    """
+    local = get_classical_runner(key) if family == "classical" else get_quantum_runner(key)
+    runner = WORKER_POOL.runner(family, key) if WORKER_POOL is not None else local
+    # coalescing wraps admission, so requests that attach to an in-flight call take no slot
+    return coalesced(RUNNER_FLIGHT, family, key, admitted(ADMISSION, family, runner))
+
+def _too_busy(e: AdmissionRejected) -> HTTPException:
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+def _split_shape(X_tr, X_te, classes: List[str]) -> Shape:
+    return Shape(len(X_tr), len(X_te), int(X_tr.shape[1]), len(classes))
+
+def _budgeted(family: str, key: str, shape: Shape, params: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """(params to run with, estimate); over budget it downscales or raises 422."""
+    try:
+        return BUDGET.apply(ESTIMATOR, family, key, shape, params)
+    except BudgetExceeded as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+def _estimate_entry(family: str, key: str, shape: Shape, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Estimate for display: never raises on budget, reports refusal/downscaling instead."""
+    try:
+        run_params, est = BUDGET.apply(ESTIMATOR, family, key, shape, params)
+        return est | {"params": run_params, "refused": None}
+    except BudgetExceeded as e:
+        return ESTIMATOR.estimate(family, key, shape, params) | {"params": params, "refused": str(e)}
+
 def _preview_from_df(df: pd.DataFrame, filename: str) -> Dict[str, Any]:
     headers: List[str] = [str(c) for c in df.columns]
     n_rows, n_cols = int(df.shape[0]), int(df.shape[1])
@@ -93,17 +232,20 @@ class ComparePayload(BaseModel):
 # Endpoints
 # ---------------------------
 @app.get("/api/health")
-def health():
+async def health():
+    # async on purpose: answered on the event loop even when every worker thread is busy
     return {"ok": True, "service": "qml-compare-api"}
 
 @app.post("/api/preview")
 async def preview(file: UploadFile = File(...)):
-    """Small CSV preview for the UI head-check."""
-    content = await file.read()
+    """Small dataset preview for the UI head-check."""
+    path, _ = await run_in_threadpool(_spool_upload, file)
     try:
-        df = _read_csv(content)
+        df = await run_in_threadpool(_read_csv, path, file.filename)
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Could not read CSV: {e}")
+        raise HTTPException(status_code=400, detail=f"Could not read dataset: {e}")
+    finally:
+        _discard(path)
     if df.empty:
         raise HTTPException(status_code=400, detail="CSV has no rows.")
     if df.shape[1] < 2:
@@ -122,16 +264,32 @@ async def quickcheck(
             "analysis": {"type": data_type, "note": "Only tabular supported in API"},
             "recommendation": {"classical": "mlp", "quantum": "qnn"},
         }
-    content = await file.read()
+    path, _ = await run_in_threadpool(_spool_upload, file)
     try:
-        df = _read_csv(content)
+        df = await run_in_threadpool(_read_csv, path, file.filename)
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Could not read CSV: {e}")
+        raise HTTPException(status_code=400, detail=f"Could not read dataset: {e}")
+    finally:
+        _discard(path)
+
+    return await run_in_threadpool(_quickcheck_report, df, target)
 
+def _quickcheck_report(df: pd.DataFrame, target: Optional[str]) -> Dict[str, Any]:
     analyzer = DatasetAnalyzer(df, target=target, data_type="tabular")
     analysis = analyzer.analyze()
     rec = ModelSelector(analysis).recommend()
-    return {"analysis": analysis, "recommendation": rec}
+
+    # default-params cost of the recommended pair, from counts only (no split or scaling)
+    try:
+        target_used, _ = _infer_target_column(df, target)
+        features = df.drop(columns=[target_used]).select_dtypes(include=["number"]).shape[1]
+        shape = Shape.from_rows(len(df), features, int(df[target_used].nunique()))
+        estimate: Dict[str, Any] = {
+            family: _estimate_entry(family, rec[family], shape, {}) for family in ("classical", "quantum")
+        }
+    except Exception as e:
+        estimate = {"error": f"{type(e).__name__}: {e}"}
+    return {"analysis": analysis, "recommendation": rec, "estimate": estimate}
 
 @app.post("/api/compare")
 async def compare_api(
@@ -177,50 +335,104 @@ async def compare_api(
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid payload: {e}")
 
-    # 2) Prepare data
-    csv_bytes = await file.read()
+    # 2) Identical in-flight requests (same upload bytes, target, models, params) share one run
+    path, dataset_hash = await run_in_threadpool(_spool_upload, file)
+    key = (dataset_hash, p.targetColumn, p.classicalModel, p.quantumModel,
+           canonical_json(p.classicalParams), canonical_json(p.quantumParams))
+    leader = False
+    def job():
+        nonlocal leader
+        leader = True  # called synchronously by the leader only; the job now owns `path`
+        return _run_compare(p, path, dataset_hash, file.filename)
+    try:
+        result, shared = await COMPARE_FLIGHT.do(key, job)
+    finally:
+        if not leader:
+            _discard(path)
+    if shared:
+        result = result | {"coalesced": result["coalesced"] | {"request": True}}
+    return result
+
+async def _run_compare(p: ComparePayload, path: str, dataset_hash: str, filename: Optional[str]) -> Dict[str, Any]:
+    """Prepare, run both sides off the event loop, record. Returns the /api/compare response."""
+    try:
+        ADMISSION.check(("classical", "quantum"))
+    except AdmissionRejected as e:
+        _discard(path)
+        raise _too_busy(e)
     try:
         (
             X_tr, X_te, y_tr, y_te,
             label_encoder, scaler,
             target_note, dataset_info
-        ) = prepare_data_from_csv(csv_bytes, p.targetColumn)
+        ) = await run_in_threadpool(prepare_data_from_csv, path, p.targetColumn, filename=filename)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Data error: {e}")
+    finally:
+        _discard(path)
 
     classes = dataset_info["classes"]
 
-    # 3) Run classical
     try:
-        run_classical = get_classical_runner(p.classicalModel)
+        run_classical = _resolve_runner("classical", p.classicalModel)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Unknown classical model '{p.classicalModel}': {e}")
+    try:
+        run_quantum = _resolve_runner("quantum", p.quantumModel)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Unknown quantum model '{p.quantumModel}': {e}")
 
+    shape = _split_shape(X_tr, X_te, classes)
+    p.classicalParams, c_est = _budgeted("classical", p.classicalModel, shape, p.classicalParams)
+    p.quantumParams, q_est = _budgeted("quantum", p.quantumModel, shape, p.quantumParams)
+
+    # the quantum queue is the scarce one: if it is already full, reject now rather than
+    # after training classical. Nothing is held here; the quantum slot is taken by the
+    # (coalesced) runner call itself.
+    try:
+        ADMISSION.gates["quantum"].check()
+    except AdmissionRejected as e:
+        raise _too_busy(e)
+
+    # classical
     try:
         t0 = time.perf_counter()
-        proba_c, c_timings, c_extras = run_classical(X_tr, y_tr, X_te, p.classicalParams, classes)
+        proba_c, c_timings, c_extras = await run_in_threadpool(
+            run_classical, X_tr, y_tr, X_te, p.classicalParams, classes)
         c_total = (time.perf_counter() - t0) * 1000.0
         c_metrics = metrics_from_probs(y_te, proba_c) | {"latency_ms": c_total}
         c_details = details_from_preds(y_te, proba_c, classes, timings=c_timings, extras=c_extras)
+    except AdmissionRejected as e:
+        raise _too_busy(e)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Classical model '{p.classicalModel}' failed: {e}")
 
-    # 4) Run quantum
-    try:
-        run_quantum = get_quantum_runner(p.quantumModel)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Unknown quantum model '{p.quantumModel}': {e}")
-
+    # quantum
     try:
         t0 = time.perf_counter()
-        proba_q, q_timings, q_extras = run_quantum(X_tr, y_tr, X_te, p.quantumParams, classes)
+        proba_q, q_timings, q_extras = await run_in_threadpool(
+            run_quantum, X_tr, y_tr, X_te, p.quantumParams, classes)
         q_total = (time.perf_counter() - t0) * 1000.0
         q_metrics = metrics_from_probs(y_te, proba_q) | {"latency_ms": q_total}
         q_details = details_from_preds(y_te, proba_q, classes, timings=q_timings, extras=q_extras)
+    except AdmissionRejected as e:
+        raise _too_busy(e)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Quantum model '{p.quantumModel}' failed: {e}")
 
-    # 5) Diagnostics (cap size)
+    run_id = RUN_STORE.record(
+        "compare", dataset_hash, dataset_info,
+        models=[
+            {"family": "classical", "model": p.classicalModel, "params": p.classicalParams,
+             "metrics": c_metrics, "timings": c_timings},
+            {"family": "quantum", "model": p.quantumModel, "params": p.quantumParams,
+             "metrics": q_metrics, "timings": q_timings},
+        ],
+        total_ms=c_total + q_total,
+        filename=filename,
+    )
+
+    # diagnostics (cap size)
     max_points = 5000
     diag = {
         "y_true": y_te.tolist()[:max_points],
@@ -228,8 +440,9 @@ async def compare_api(
         "quantum":   {"proba": proba_q[:max_points].tolist()},
     }
 
-    # 6) Response
     return {
+        "run_id": run_id,
+        "dataset_hash": dataset_hash,
         "summary": {
             "classicalModel": p.classicalModel,
             "quantumModel": p.quantumModel,
@@ -241,10 +454,311 @@ async def compare_api(
         },
         "metrics": {"classical": c_metrics, "quantum": q_metrics},
         "details": {"classical": c_details, "quantum": q_details},
+        "estimate": {"classical": c_est, "quantum": q_est},
+        "coalesced": {"request": False, "classical": bool(c_extras.get("coalesced")),
+                      "quantum": bool(q_extras.get("coalesced"))},
+        "admission": {"classical": c_extras.get("admission"), "quantum": q_extras.get("admission")},
+        "diagnostics": diag,
+        "notes": target_note,
+    }
+
+@app.post("/api/tournament")
+async def tournament_api(
+    file: UploadFile = File(...),
+    classicalModels: Optional[str] = Form(None),
+    quantumModels: Optional[str] = Form(None),
+    classicalParams: Optional[str] = Form(None),
+    quantumParams: Optional[str] = Form(None),
+    targetColumn: Optional[str] = Form(None),
+    maxWorkers: Optional[int] = Form(None),
+):
+    """
+    Run many classical and quantum models against one prepared dataset.
+
+    classicalModels / quantumModels: JSON arrays of registry keys.
+    classicalParams / quantumParams: JSON objects mapping model key -> params.
+    maxWorkers caps how many runners train concurrently; it is clamped to the server's
+    QML_TOURNAMENT_MAX_WORKERS. Each model key may appear once per family.
+    """
+    c_keys = _parse_json_list("classicalModels", classicalModels)
+    q_keys = _parse_json_list("quantumModels", quantumModels)
+    if not c_keys and not q_keys:
+        raise HTTPException(status_code=400, detail="Provide at least one of classicalModels or quantumModels.")
+    c_params = _parse_json_obj("classicalParams", classicalParams)
+    q_params = _parse_json_obj("quantumParams", quantumParams)
+    try:
+        ADMISSION.check([f for f, keys in (("classical", c_keys), ("quantum", q_keys)) if keys])
+    except AdmissionRejected as e:
+        raise _too_busy(e)
+
+    entries: List[Dict[str, Any]] = []
+    for family, keys, params, resolve in (
+        ("classical", c_keys, c_params, get_classical_runner),
+        ("quantum", q_keys, q_params, get_quantum_runner),
+    ):
+        for key in keys:
+            try:
+                resolve(key)
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=f"Unknown {family} model '{key}': {e}")
+            entry_params = params.get(key, {})
+            if not isinstance(entry_params, dict):
+                raise HTTPException(status_code=400, detail=f"{family}Params['{key}'] must be a JSON object.")
+            if any(e["family"] == family and e["model"] == key for e in entries):
+                raise HTTPException(status_code=400, detail=f"{family} model '{key}' is listed more than once.")
+            entries.append({"family": family, "model": key, "params": entry_params})
+
+    # Prepare once for every entry
+    path, dataset_hash = await run_in_threadpool(_spool_upload, file)
+    try:
+        (
+            X_tr, X_te, y_tr, y_te,
+            label_encoder, scaler,
+            target_note, dataset_info
+        ) = await run_in_threadpool(prepare_data_from_csv, path, targetColumn, filename=file.filename)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Data error: {e}")
+    finally:
+        _discard(path)
+
+    classes = dataset_info["classes"]
+    shape = _split_shape(X_tr, X_te, classes)
+    for e in entries:
+        try:
+            e["params"], e["estimate"] = BUDGET.apply(ESTIMATOR, e["family"], e["model"], shape, e["params"])
+        except BudgetExceeded as err:
+            e["refused"] = str(err)  # ranks last with this error; the rest still run
+    result = await run_in_threadpool(
+        run_tournament, entries, X_tr, y_tr, X_te, y_te, classes, maxWorkers, _resolve_runner,
+        {f: g.limit for f, g in ADMISSION.gates.items()},
+    )
+
+    run_id = RUN_STORE.record(
+        "tournament", dataset_hash, dataset_info,
+        models=[
+            {"family": row["family"], "model": row["model"], "params": row["params"],
+             "metrics": row.get("metrics"), "timings": (row.get("details") or {}).get("timings"),
+             "error": row.get("error")}
+            for row in result["leaderboard"]
+        ],
+        total_ms=result["total_ms"],
+        filename=file.filename,
+    )
+
+    max_points = 5000
+    diag: Dict[str, Any] = {"y_true": y_te.tolist()[:max_points]}
+    for row in result["leaderboard"]:
+        proba = row.pop("proba", None)
+        if proba is not None:
+            diag[f"{row['family']}:{row['model']}"] = {"proba": proba[:max_points].tolist()}
+
+    return {
+        "run_id": run_id,
+        "dataset_hash": dataset_hash,
+        "summary": {
+            "classicalModels": c_keys,
+            "quantumModels": q_keys,
+            "samples": dataset_info["n_samples"],
+            "target": dataset_info["target"],
+            "n_features": dataset_info["n_features"],
+            "classes": classes,
+            "class_counts": dataset_info["class_counts"],
+            "max_workers": result["max_workers"],
+            "total_ms": result["total_ms"],
+        },
+        "leaderboard": result["leaderboard"],
         "diagnostics": diag,
         "notes": target_note,
     }
 
+def _run_stream(path: str, filename: Optional[str], target: Optional[str], key: str,
+                params: Dict[str, Any], chunk_rows: int):
+    """Scan, train over file chunks, score the test sample; holds one classical slot throughout."""
+    with ADMISSION.gates["classical"].slot() as ticket:
+        try:
+            ds = scan_dataset(path, target, filename, chunk_rows=chunk_rows)
+        except Exception as e:
+            raise ValueError(f"Data error: {e}") from e
+        featurize, clf, timings, extras = fit_stream(
+            key, lambda epoch: ds.batches("train", shuffle_seed=epoch),
+            len(ds.features), len(ds.classes), params)
+        X_ev, y_ev = ds.eval_split()
+        t1 = time.perf_counter()
+        proba = predict_stream(featurize, clf, X_ev, len(ds.classes))
+        timings["infer_ms"] = (time.perf_counter() - t1) * 1000.0
+    timings["scan_ms"] = ds.scan_ms
+    return ds, proba, y_ev, timings, extras | {"admission": ticket}
+
+@app.post("/api/stream")
+async def stream_api(
+    file: UploadFile = File(...),
+    classicalModel: str = Form("sgd_logreg"),
+    classicalParams: Optional[str] = Form(None),
+    targetColumn: Optional[str] = Form(None),
+    chunkRows: Optional[int] = Form(None),
+):
+    """
+    Out-of-core classical baseline for datasets too large for /api/compare.
+
+    The upload is read in chunkRows-row chunks (one scan pass for schema, labels and
+    scaling, then `epochs` training passes, default 1) and trained with an incremental
+    model: sgd_logreg, sgd_rbf or mlp_stream. Memory is bounded by the chunk size;
+    metrics are computed on a uniform sample of the held-out rows.
+    """
+    if classicalModel not in STREAM_MODELS:
+        raise HTTPException(status_code=400,
+                            detail=f"Model '{classicalModel}' cannot stream. Available: {list(STREAM_MODELS)}")
+    params = _parse_json_obj("classicalParams", classicalParams)
+    chunk_rows = int(chunkRows or params.get("chunk_rows") or DEFAULT_CHUNK_ROWS)
+    if chunk_rows < 1:
+        raise HTTPException(status_code=400, detail="chunkRows must be positive.")
+    try:
+        ADMISSION.check(("classical",))
+    except AdmissionRejected as e:
+        raise _too_busy(e)
+
+    path, dataset_hash = await run_in_threadpool(_spool_upload, file)
+    try:
+        t0 = time.perf_counter()
+        ds, proba, y_ev, timings, extras = await run_in_threadpool(
+            _run_stream, path, file.filename, targetColumn, classicalModel, params, chunk_rows)
+        total = (time.perf_counter() - t0) * 1000.0
+    except AdmissionRejected as e:
+        raise _too_busy(e)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Streaming model '{classicalModel}' failed: {e}")
+    finally:
+        _discard(path)
+
+    info = ds.info()
+    metrics = metrics_from_probs(y_ev, proba) | {"latency_ms": total}
+    details = details_from_preds(y_ev, proba, ds.classes, timings=timings, extras=extras)
+    run_id = RUN_STORE.record(
+        "stream", dataset_hash, info,
+        models=[{"family": "classical", "model": classicalModel, "params": params | {"chunk_rows": chunk_rows},
+                 "metrics": metrics, "timings": timings}],
+        total_ms=total,
+        filename=file.filename,
+    )
+    max_points = 5000
+    return {
+        "run_id": run_id,
+        "dataset_hash": dataset_hash,
+        "summary": {
+            "classicalModel": classicalModel,
+            "samples": info["n_samples"],
+            "target": info["target"],
+            "n_features": info["n_features"],
+            "classes": ds.classes,
+            "class_counts": info["class_counts"],
+            "n_train": info["n_train"],
+            "n_test": info["n_test"],
+            "n_eval": info["n_eval"],
+            "n_dropped": info["n_dropped"],
+            "chunk_rows": chunk_rows,
+        },
+        "metrics": {"classical": metrics},
+        "details": {"classical": details},
+        "admission": {"classical": extras.get("admission")},
+        "diagnostics": {"y_true": y_ev.tolist()[:max_points],
+                        "classical": {"proba": proba[:max_points].tolist()}},
+        "notes": ds.target_note,
+    }
+
+@app.post("/api/estimate")
+async def estimate_api(
+    file: Optional[UploadFile] = File(None),
+    targetColumn: Optional[str] = Form(None),
+    rows: Optional[int] = Form(None),
+    features: Optional[int] = Form(None),
+    classes: Optional[int] = Form(None),
+    classicalModels: Optional[str] = Form(None),
+    quantumModels: Optional[str] = Form(None),
+    classicalParams: Optional[str] = Form(None),
+    quantumParams: Optional[str] = Form(None),
+):
+    """
+    Predicted train/infer time and peak memory per runner, without running anything.
+
+    Shape comes from an uploaded dataset (prepared exactly like /api/compare) or from
+    rows/features/classes. Model lists default to every runner; params are JSON objects
+    keyed by model, as in /api/tournament.
+    """
+    if file is not None:
+        path, _ = await run_in_threadpool(_spool_upload, file)
+        try:
+            X_tr, X_te, _, _, _, _, _, info = await run_in_threadpool(
+                prepare_data_from_csv, path, targetColumn, file.filename)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Data error: {e}")
+        finally:
+            _discard(path)
+        shape = _split_shape(X_tr, X_te, info["classes"])
+    elif rows and features:
+        shape = Shape.from_rows(rows, features, classes or 2)
+    else:
+        raise HTTPException(status_code=400, detail="Upload a file or give rows and features.")
+
+    c_keys = _parse_json_list("classicalModels", classicalModels)
+    q_keys = _parse_json_list("quantumModels", quantumModels)
+    if not c_keys and not q_keys:
+        c_keys = [k for f, k in COST_MODELS if f == "classical"]
+        q_keys = [k for f, k in COST_MODELS if f == "quantum"]
+    c_params = _parse_json_obj("classicalParams", classicalParams)
+    q_params = _parse_json_obj("quantumParams", quantumParams)
+
+    estimates = []
+    for family, keys, params in (("classical", c_keys, c_params), ("quantum", q_keys, q_params)):
+        for key in keys:
+            if (family, key) not in COST_MODELS:
+                raise HTTPException(status_code=400, detail=f"Unknown {family} model '{key}'.")
+            estimates.append(_estimate_entry(family, key, shape, params.get(key) or {}))
+    return {
+        "shape": {"n_train": shape.n_train, "n_test": shape.n_test,
+                  "features": shape.features, "classes": shape.classes},
+        "estimates": estimates,
+        "budget": BUDGET.describe(),
+        "calibration": ESTIMATOR.status()["calibration"],
+    }
+
+@app.get("/api/admission")
+async def admission():
+    """Per-family slots in use, queue depth, mean wait and rejection counts."""
+    return ADMISSION.stats()
+
+@app.get("/api/coalescing")
+def coalescing():
+    """In-flight dedup counters: leaders did the work, hits attached to a leader."""
+    return {"requests": COMPARE_FLIGHT.stats(), "runners": RUNNER_FLIGHT.stats()}
+
+@app.get("/api/workers")
+def workers():
+    """Remote worker pool status (empty when runners execute in-process)."""
+    if WORKER_POOL is None:
+        return {"enabled": False, "workers": []}
+    return {"enabled": True, "workers": WORKER_POOL.status()}
+
+@app.get("/api/runs")
+def list_runs(
+    dataset: Optional[str] = Query(None, description="sha256 of the uploaded file"),
+    model: Optional[str] = Query(None, description="registry key, e.g. 'svm' or 'qnn'"),
+    family: Optional[str] = Query(None, pattern="^(classical|quantum)$"),
+    since: Optional[float] = Query(None, description="unix seconds, inclusive"),
+    until: Optional[float] = Query(None, description="unix seconds, exclusive"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+):
+    """Past compare/tournament runs, newest first."""
+    return RUN_STORE.list_runs(dataset=dataset, model=model, family=family,
+                               since=since, until=until, limit=limit, offset=offset)
+
+@app.get("/api/runs/{run_id}")
+def get_run(run_id: str):
+    run = RUN_STORE.get_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Run '{run_id}' not found (it may still be queued).")
+    return run
+
 # Dev runner
 if __name__ == "__main__":
     import uvicorn
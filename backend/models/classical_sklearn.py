@@ -22,7 +22,10 @@ def run_classical(key: str, Xtr, ytr, Xte, params: Dict, classes: List[str]) ->
     elif key == "rf":
         n_estimators = int(params.get("n_estimators", 200))
         max_depth = params.get("max_depth", None); max_depth = None if max_depth in (None, "", "null") else int(max_depth)
-        clf = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=7)
+        # single-threaded by default: runners already execute side by side (tournament pool,
+        # admission slots), so n_jobs=-1 per runner would oversubscribe the cores
+        n_jobs = params.get("n_jobs"); n_jobs = None if n_jobs in (None, "", "null") else int(n_jobs)
+        clf = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, n_jobs=n_jobs, random_state=7)
     elif key == "logreg":
         C = float(params.get("C", 1.0)); clf = LogisticRegression(max_iter=200, C=C, n_jobs=None)
     else:
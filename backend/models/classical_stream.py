@@ -0,0 +1,138 @@
+# backend/models/classical_stream.py
+"""
+Incremental (partial_fit) classical baselines. Training only ever sees one block
+of rows at a time, so the same code trains on an in-memory split (registry
+runners) or on chunks streamed from disk (core.stream / POST /api/stream).
+
+  sgd_logreg  logistic regression by averaged SGD
+  sgd_rbf     random Fourier features (RBF kernel approximation) + averaged SGD
+  mlp_stream  one-hidden-layer MLP, Adam, one partial_fit per block
+"""
+from __future__ import annotations
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+from sklearn.kernel_approximation import RBFSampler
+from sklearn.linear_model import SGDClassifier
+from sklearn.neural_network import MLPClassifier
+
+STREAM_MODELS = ("sgd_logreg", "sgd_rbf", "mlp_stream")
+
+# featurized rows handed to partial_fit at once (~16 MB of float64), whatever the chunk size
+_BLOCK_BYTES = 16 * 1024 * 1024
+# per-chunk records kept in extras; longer runs report summary stats only past this
+_MAX_CHUNK_RECORDS = 256
+
+Batches = Callable[[int], Iterable[Tuple[np.ndarray, np.ndarray]]]
+
+
+def _identity(X: np.ndarray) -> np.ndarray:
+    return X
+
+
+def make_stream_model(key: str, n_features: int, params: Dict):
+    """(featurize, estimator, featurized width) for a streaming model key."""
+    alpha = float(params.get("alpha", 1e-4))
+    if key == "sgd_logreg":
+        clf = SGDClassifier(loss="log_loss", alpha=alpha, average=True, random_state=7)
+        return _identity, clf, n_features
+    if key == "sgd_rbf":
+        n_components = int(params.get("n_components", 300))
+        gamma = params.get("gamma", "scale")
+        # inputs are standardized, so the 'scale' heuristic of SVC reduces to 1 / n_features
+        gamma = 1.0 / n_features if gamma in (None, "", "scale") else float(gamma)
+        rff = RBFSampler(gamma=gamma, n_components=n_components, random_state=7).fit(np.zeros((1, n_features)))
+        clf = SGDClassifier(loss="log_loss", alpha=alpha, average=True, random_state=7)
+        return rff.transform, clf, n_components
+    if key == "mlp_stream":
+        hidden = int(params.get("hidden", 64)); lr = float(params.get("lr", 0.003))
+        batch = int(params.get("batch_size", 256))
+        clf = MLPClassifier(hidden_layer_sizes=(hidden,), activation="relu", solver="adam",
+                            learning_rate_init=lr, batch_size=batch, random_state=7, verbose=False)
+        return _identity, clf, n_features
+    raise ValueError(f"unknown streaming classical key {key}")
+
+
+def _chunk_summary(records: List[Dict[str, float]], rows: int, train_ms: float) -> Dict:
+    fit = np.array([r["fit_ms"] for r in records]) if records else np.zeros(1)
+    io = np.array([r["io_ms"] for r in records]) if records else np.zeros(1)
+    return {
+        "chunks": len(records),
+        "rows": rows,
+        "fit_ms_mean": float(fit.mean()), "fit_ms_p95": float(np.percentile(fit, 95)), "fit_ms_max": float(fit.max()),
+        "io_ms_mean": float(io.mean()), "io_ms_total": float(io.sum()),
+        "rows_per_s": rows / (train_ms / 1000.0) if train_ms > 0 else None,
+    }
+
+
+def fit_stream(key: str, batches: Batches, n_features: int, n_classes: int, params: Dict,
+               default_epochs: int = 1):
+    """
+    Train over `batches(epoch)` for `epochs` passes. Returns (featurize, estimator,
+    timings, extras); extras["chunk_timing"] has per-chunk I/O (time to produce the
+    block: read + clean + scale) and fit milliseconds.
+    """
+    epochs = max(1, int(params.get("epochs", default_epochs)))
+    featurize, clf, width = make_stream_model(key, n_features, params)
+    block = max(1, _BLOCK_BYTES // (8 * width))
+    all_classes = np.arange(n_classes)
+
+    records: List[Dict[str, float]] = []
+    rows = 0
+    t0 = time.perf_counter()
+    for epoch in range(epochs):
+        it = iter(batches(epoch))
+        while True:
+            t_io = time.perf_counter()
+            nxt = next(it, None)
+            if nxt is None:
+                break
+            X, y = nxt
+            t_fit = time.perf_counter()
+            for s in range(0, len(y), block):
+                clf.partial_fit(featurize(X[s:s + block]), y[s:s + block], classes=all_classes)
+            done = time.perf_counter()
+            records.append({"epoch": epoch, "rows": int(len(y)),
+                            "io_ms": (t_fit - t_io) * 1000.0, "fit_ms": (done - t_fit) * 1000.0})
+            rows += int(len(y))
+    train_ms = (time.perf_counter() - t0) * 1000.0
+    if not records:
+        raise ValueError("No training rows.")
+
+    timings = {"train_ms": train_ms, "io_ms": float(sum(r["io_ms"] for r in records))}
+    extras = {
+        "epochs": epochs,
+        "chunk_timing": _chunk_summary(records, rows, train_ms),
+        "chunks": records[:_MAX_CHUNK_RECORDS],
+    }
+    return featurize, clf, timings, extras
+
+
+def predict_stream(featurize, clf, X: np.ndarray, n_classes: int) -> np.ndarray:
+    """predict_proba in blocks; columns always cover every class index."""
+    block = max(1, _BLOCK_BYTES // (8 * featurize(X[:1]).shape[1])) if len(X) else 1
+    out = np.zeros((len(X), n_classes))
+    cols = clf.classes_.astype(int)
+    for s in range(0, len(X), block):
+        out[s:s + block, cols] = clf.predict_proba(featurize(X[s:s + block]))
+    return out
+
+
+def run_classical_stream(key: str, Xtr, ytr, Xte, params: Dict, classes: List[str]) -> Tuple[np.ndarray, Dict, Dict]:
+    """Registry runner: the in-memory split, fed to the incremental learner in chunk_rows blocks."""
+    chunk = max(1, int(params.get("chunk_rows", 50_000)))
+
+    def batches(epoch: int):
+        # reshuffle between epochs so SGD does not see the same order every pass
+        order = np.random.default_rng([7, epoch]).permutation(len(ytr))
+        for s in range(0, len(order), chunk):
+            idx = order[s:s + chunk]
+            yield Xtr[idx], ytr[idx]
+
+    featurize, clf, timings, extras = fit_stream(key, batches, Xtr.shape[1], len(classes), params,
+                                                 default_epochs=20)
+    t1 = time.perf_counter()
+    proba = predict_stream(featurize, clf, Xte, len(classes))
+    timings["infer_ms"] = (time.perf_counter() - t1) * 1000.0
+    return proba, timings, extras
@@ -1,5 +1,7 @@
 from typing import Dict, List, Tuple
-import time, math, numpy as np
+import copy, time, math, numpy as np
+
+from core.checkpoints import plan_resume, resume_extras, save_checkpoint
 
 def run_hybrid_torch_qcnn(Xtr, ytr, Xte, params: Dict, classes: List[str]) -> Tuple[np.ndarray, Dict, Dict]:
     try:
@@ -9,14 +11,16 @@ def run_hybrid_torch_qcnn(Xtr, ytr, Xte, params: Dict, classes: List[str]) -> Tu
     except Exception as e:
         raise RuntimeError(f"hybrid_torch requires torch and pennylane. Install: pip install torch pennylane. Original error: {e}")
 
-    torch.manual_seed(42)
-
     n_qubits = int(params.get("n_qubits", max(2, min(6, Xtr.shape[1]))))
     n_layers = int(params.get("layers", 2))
     epochs = int(params.get("epochs", 15))
     lr = float(params.get("lr", 1e-3))
     batch_size = int(params.get("batch_size", 32))
     n_outputs = len(classes)
+    plan = plan_resume("hybrid_torch_qcnn", Xtr, ytr,
+                       {"n_qubits": n_qubits, "layers": n_layers, "lr": lr, "batch_size": batch_size}, epochs, params)
+    # a resumed run continues with a fresh shuffle order rather than replaying the first epochs
+    torch.manual_seed(42 + plan.epochs_reused)
 
     dev = qml.device("default.qubit", wires=n_qubits, shots=None)
 
@@ -51,11 +55,14 @@ def run_hybrid_torch_qcnn(Xtr, ytr, Xte, params: Dict, classes: List[str]) -> Tu
 
     model = HybridQCNN()
     opt = torch.optim.Adam(model.parameters(), lr=lr)
+    if plan.state:
+        model.load_state_dict(plan.state["model"])
+        opt.load_state_dict(plan.state["optimizer"])
     criterion = torch.nn.CrossEntropyLoss()
 
     t0 = time.perf_counter()
     model.train()
-    for _ in range(epochs):
+    for _ in range(plan.epochs_to_train):
         for xb, yb in dl:
             opt.zero_grad()
             logits = model(xb)
@@ -63,11 +70,15 @@ def run_hybrid_torch_qcnn(Xtr, ytr, Xte, params: Dict, classes: List[str]) -> Tu
             loss.backward()
             opt.step()
     train_ms = (time.perf_counter() - t0) * 1000.0
+    ckpt_id = save_checkpoint(plan, {"model": copy.deepcopy(model.state_dict()),
+                                     "optimizer": copy.deepcopy(opt.state_dict())})
 
+    t1 = time.perf_counter()
     model.eval()
     with torch.no_grad():
         logits = model(Xte_t).numpy()
     proba = np.exp(logits - logits.max(axis=1, keepdims=True))
     proba = proba / proba.sum(axis=1, keepdims=True)
+    infer_ms = (time.perf_counter() - t1) * 1000.0
 
-    return proba, {"train_ms": train_ms, "infer_ms": 0.0}, {"n_qubits": n_qubits, "n_layers": n_layers}
+    return proba, {"train_ms": train_ms, "infer_ms": infer_ms}, {"n_qubits": n_qubits, "n_layers": n_layers} | resume_extras(plan, ckpt_id)
@@ -1,5 +1,7 @@
 from typing import Dict, List, Tuple
-import time, numpy as np
+import copy, time, numpy as np
+
+from core.checkpoints import plan_resume, resume_extras, save_checkpoint
 
 def run_mlp_torch(Xtr, ytr, Xte, params: Dict, classes: List[str]) -> Tuple[np.ndarray, Dict, Dict]:
     try:
@@ -8,8 +10,6 @@ def run_mlp_torch(Xtr, ytr, Xte, params: Dict, classes: List[str]) -> Tuple[np.n
     except Exception as e:
         raise RuntimeError(f"mlp_torch requires torch. Install: pip install torch. Original error: {e}")
 
-    torch.manual_seed(42)
-
     hidden_cfg = params.get("hidden", [64, 64])
     if isinstance(hidden_cfg, (list, tuple)):
         hidden = tuple(int(h) for h in hidden_cfg)
@@ -21,6 +21,10 @@ def run_mlp_torch(Xtr, ytr, Xte, params: Dict, classes: List[str]) -> Tuple[np.n
     batch = int(params.get("batch_size", 64))
     dropout = float(params.get("dropout", 0.0))
     n_out = len(classes)
+    plan = plan_resume("mlp_torch", Xtr, ytr,
+                       {"hidden": list(hidden), "lr": lr, "batch_size": batch, "dropout": dropout}, epochs, params)
+    # a resumed run continues with a fresh shuffle order rather than replaying the first epochs
+    torch.manual_seed(42 + plan.epochs_reused)
 
     class MLP(nn.Module):
         def __init__(self, d_in: int, hidden: tuple, d_out: int, dropout: float = 0.0):
@@ -43,6 +47,9 @@ def run_mlp_torch(Xtr, ytr, Xte, params: Dict, classes: List[str]) -> Tuple[np.n
 
     model = MLP(d_in=Xtr.shape[1], hidden=hidden, d_out=n_out, dropout=dropout)
     opt = torch.optim.Adam(model.parameters(), lr=lr)
+    if plan.state:
+        model.load_state_dict(plan.state["model"])
+        opt.load_state_dict(plan.state["optimizer"])
     loss_fn = nn.CrossEntropyLoss()
 
     ds = torch.utils.data.TensorDataset(Xtr_t, ytr_t)
@@ -50,7 +57,7 @@ def run_mlp_torch(Xtr, ytr, Xte, params: Dict, classes: List[str]) -> Tuple[np.n
 
     t0 = time.perf_counter()
     model.train()
-    for _ in range(epochs):
+    for _ in range(plan.epochs_to_train):
         for xb, yb in dl:
             opt.zero_grad()
             logits = model(xb)
@@ -58,11 +65,15 @@ def run_mlp_torch(Xtr, ytr, Xte, params: Dict, classes: List[str]) -> Tuple[np.n
             loss.backward()
             opt.step()
     train_ms = (time.perf_counter() - t0) * 1000.0
+    ckpt_id = save_checkpoint(plan, {"model": copy.deepcopy(model.state_dict()),
+                                     "optimizer": copy.deepcopy(opt.state_dict())})
 
+    t1 = time.perf_counter()
     model.eval()
     with torch.no_grad():
         logits = model(Xte_t).numpy()
     proba = np.exp(logits - logits.max(axis=1, keepdims=True))
     proba = proba / proba.sum(axis=1, keepdims=True)
+    infer_ms = (time.perf_counter() - t1) * 1000.0
 
-    return proba, {"train_ms": train_ms, "infer_ms": 0.0}, {"hidden": list(hidden)}
+    return proba, {"train_ms": train_ms, "infer_ms": infer_ms}, {"hidden": list(hidden)} | resume_extras(plan, ckpt_id)
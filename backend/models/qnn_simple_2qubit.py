@@ -3,6 +3,9 @@ import time, numpy as np
 import pennylane as qml
 from pennylane import numpy as pnp
 
+from core.checkpoints import plan_resume, resume_extras, save_checkpoint
+from core.reduce import fit_reducer
+
 def _dev(): return qml.device("default.qubit", wires=2)
 
 def _encode(x):
@@ -26,9 +29,16 @@ def _make_qnode():
     return qnode
 
 def run_qnn_simple(Xtr, ytr, Xte, params: Dict, classes: List[str]) -> Tuple[np.ndarray, Dict, Dict]:
-    # Use only first 2 features (model is 2-qubit)
-    Xtr2 = Xtr[:, :2].copy()
-    Xte2 = Xte[:, :2].copy()
+    # Model is 2-qubit: reduce to 2 features (default keeps the first 2 columns)
+    reducer = str(params.get("reducer") or "slice")
+    # reducer fit counts as training, as in vqc; projecting Xte counts as inference
+    t0 = time.perf_counter()
+    proj, _ = fit_reducer(reducer, Xtr, 2)
+    Xtr2 = proj.transform(Xtr)
+
+    lr = float(params.get("lr", 0.1))
+    epochs = int(params.get("epochs", 25))
+    plan = plan_resume("qnn_simple", Xtr, ytr, {"reducer": reducer, "lr": lr}, epochs, params)
 
     qnode = _make_qnode()
     rng = np.random.default_rng(7)
@@ -36,16 +46,21 @@ def run_qnn_simple(Xtr, ytr, Xte, params: Dict, classes: List[str]) -> Tuple[np.
     def to_margin(w, X): return pnp.array([qnode(x, w) for x in X])
     def loss_mse(w, X, ypm): return pnp.mean((to_margin(w, X) - ypm)**2)
 
-    t0 = time.perf_counter()
     heads = {}
     for c in sorted(set(ytr)):
         ypm = pnp.array(np.where(ytr == c, +1, -1))
         w = pnp.array(rng.random(4), requires_grad=True)
-        opt = qml.GradientDescentOptimizer(stepsize=float(params.get("lr", 0.1)))
-        for _ in range(int(params.get("epochs", 25))):
+        if plan.state:
+            w = pnp.array(plan.state["heads"][c], requires_grad=True)
+        opt = qml.GradientDescentOptimizer(stepsize=lr)
+        for _ in range(plan.epochs_to_train):
             w, _ = opt.step_and_cost(lambda v: loss_mse(v, Xtr2, ypm), w)
         heads[c] = w
+    ckpt_id = save_checkpoint(plan, {"heads": {c: np.array(w) for c, w in heads.items()}})
+    train_ms = (time.perf_counter() - t0) * 1000.0
 
+    t1 = time.perf_counter()
+    Xte2 = proj.transform(Xte)
     scores = []
     for c in sorted(heads.keys()):
         f = np.array([qnode(x, heads[c]) for x in Xte2], dtype=float).reshape(-1,1)
@@ -53,5 +68,5 @@ def run_qnn_simple(Xtr, ytr, Xte, params: Dict, classes: List[str]) -> Tuple[np.
     S = np.hstack(scores)
     eS = np.exp(S)
     proba = eS / eS.sum(axis=1, keepdims=True)
-    total_ms = (time.perf_counter() - t0) * 1000.0
-    return proba, {"train_ms": total_ms, "infer_ms": 0.0}, {"used_features": 2}
+    infer_ms = (time.perf_counter() - t1) * 1000.0
+    return proba, {"train_ms": train_ms, "infer_ms": infer_ms}, {"used_features": 2, "reducer": reducer} | resume_extras(plan, ckpt_id)
@@ -0,0 +1,79 @@
+from typing import Dict, List, Tuple
+import os, time, numpy as np
+from sklearn.svm import SVC
+
+from core import statevector as sv
+from core.cache import LRUCache, array_fingerprint
+from core.reduce import fit_reducer
+from .vqc_ovr import _to_angles
+
+# Embedded statevectors keyed on (angle matrix fingerprint, layers). One entry is
+# n x 2^n_qubits float64 (10k rows at 12 qubits: ~330 MB), so the cap is in bytes;
+# a block over QML_EMBED_CACHE_MB on its own is recomputed instead of kept.
+_EMBED_CACHE = LRUCache(maxsize=16, max_bytes=int(float(os.environ.get("QML_EMBED_CACHE_MB", 256)) * 1024 * 1024))
+
+def _embed(A: np.ndarray, layers: int, chunk: int = 4096) -> np.ndarray:
+    """Re-uploading RY embedding + CNOT chain (vqc_ovr style), one simulation per row."""
+    n, n_qubits = A.shape
+    out = np.empty((n, 2 ** n_qubits), dtype=float)
+    for i in range(0, n, chunk):
+        a = A[i:i+chunk]
+        state = sv.zero_state(len(a), n_qubits, dtype=float)  # RY + CNOT keep amplitudes real
+        for _ in range(layers):
+            for q in range(n_qubits):
+                state = sv.apply_1q(state, sv.ry_matrices(a[:, q]), q)
+            state = sv.apply_cnot_chain(state, n_qubits)
+        out[i:i+chunk] = sv.flatten(state)
+    return out
+
+def _embed_cached(A: np.ndarray, layers: int) -> Tuple[np.ndarray, bool]:
+    key = (array_fingerprint(A), int(layers))
+    return _EMBED_CACHE.get_or_create(key, lambda: _embed(A, layers))
+
+def _fidelity_kernel(Pa: np.ndarray, Pb: np.ndarray, tile: int) -> np.ndarray:
+    """K[i, j] = |<psi_i|psi_j>|^2, built tile by tile to bound peak memory."""
+    K = np.empty((len(Pa), len(Pb)), dtype=float)
+    for i in range(0, len(Pa), tile):
+        for j in range(0, len(Pb), tile):
+            block = Pa[i:i+tile] @ Pb[j:j+tile].T
+            np.square(block, out=K[i:i+tile, j:j+tile])
+    return K
+
+def _decision_proba(scores: np.ndarray) -> np.ndarray:
+    """Probabilities from SVC decision values: logistic for binary, softmax over OvR scores otherwise."""
+    if scores.ndim == 1:
+        p1 = 1.0 / (1.0 + np.exp(-scores))
+        return np.column_stack([1.0 - p1, p1])
+    z = np.exp(scores - scores.max(axis=1, keepdims=True))
+    return z / z.sum(axis=1, keepdims=True)
+
+def run_qsvm_kernel(Xtr, ytr, Xte, params: Dict, classes: List[str]) -> Tuple[np.ndarray, Dict, Dict]:
+    """
+    Fidelity-kernel SVM. Kernel tiles bound the temporaries of each matmul, but the full
+    n_train x n_train Gram matrix (plus n_test x n_train at inference) is stored, so peak
+    memory is O(n^2). One SVC fit on it: probabilities come from the decision values rather
+    than probability=True, whose internal 5-fold Platt scaling would refit on the Gram matrix.
+    """
+    n_qubits = int(params.get("n_qubits", 4))
+    layers = int(params.get("layers", 2))
+    C = float(params.get("C", 1.0))
+    tile = int(params.get("tile_size", 1024))
+    reducer = str(params.get("reducer") or "random")
+
+    t0 = time.perf_counter()
+    proj, _ = fit_reducer(reducer, Xtr, n_qubits)
+    Ptr, tr_cached = _embed_cached(_to_angles(proj.transform(Xtr)), layers)
+    K_tr = _fidelity_kernel(Ptr, Ptr, tile)
+    clf = SVC(kernel="precomputed", C=C, decision_function_shape="ovr", random_state=7)
+    clf.fit(K_tr, ytr)
+    train_ms = (time.perf_counter() - t0) * 1000.0
+
+    t1 = time.perf_counter()
+    Pte, te_cached = _embed_cached(_to_angles(proj.transform(Xte)), layers)
+    proba = _decision_proba(clf.decision_function(_fidelity_kernel(Pte, Ptr, tile)))
+    infer_ms = (time.perf_counter() - t1) * 1000.0
+
+    return proba, {"train_ms": train_ms, "infer_ms": infer_ms}, {
+        "n_qubits": n_qubits, "layers": layers, "reducer": reducer,
+        "embed_cached": bool(tr_cached and te_cached),
+    }
@@ -3,14 +3,26 @@ import time, numpy as np
 import pennylane as qml
 import pennylane.numpy as pnp
 
-def _build_qnn(n_qubits: int, n_features: int, layers: int, noise_p: float, shots: Optional[int]):
+from core import statevector as sv
+from core.checkpoints import plan_resume, resume_extras, save_checkpoint
+from core.reduce import fit_reducer
+
+NOISE_MODELS = ("mixed", "trajectory")
+
+_PAULI_Y = np.array([[0, -1j], [1j, 0]])
+_PAULI_Z = np.array([[1, 0], [0, -1]], dtype=complex)
+
+def _rz(x: float) -> np.ndarray:
+    return np.array([[np.exp(-0.5j * x), 0], [0, np.exp(0.5j * x)]])
+
+def _to_angles(Z: np.ndarray) -> np.ndarray:
+    return np.clip(Z, -5, 5) * (np.pi / 5)
+
+def _build_qnn(n_qubits: int, layers: int, noise_p: float, shots: Optional[int]):
     dev = qml.device("default.mixed", wires=n_qubits, shots=shots)
-    rng = np.random.default_rng(7)
-    W = rng.normal(size=(n_qubits, n_features))
 
-    def embed_block(x):
-        a = W @ x
-        a = np.clip(a, -5, 5) * (np.pi / 5)
+    def embed_block(a):
+        # a: precomputed angles (projection happens once, outside the circuit)
         for q in range(n_qubits):
             qml.RY(a[q], wires=q)
     def var_block(theta):
@@ -23,9 +35,9 @@ def _build_qnn(n_qubits: int, n_features: int, layers: int, noise_p: float, shot
             for q in range(n_qubits): qml.DepolarizingChannel(p, wires=q)
 
     @qml.qnode(dev, interface="autograd")
-    def qnn_margin(x, thetas, p_noise=noise_p):
+    def qnn_margin(a, thetas, p_noise=noise_p):
         for _ in range(layers):
-            embed_block(x)
+            embed_block(a)
             var_block(thetas[_])
             noise_block(p_noise)
         return qml.expval(qml.PauliZ(0))
@@ -34,28 +46,205 @@ def _build_qnn(n_qubits: int, n_features: int, layers: int, noise_p: float, shot
         return pnp.array(rng.normal(scale=0.15, size=(layers, n_qubits, 3)), requires_grad=True)
     return qnn_margin, init_weights
 
-def _train_ovr(Xtr, ytr, n_classes, epochs, lr, n_qubits, layers, noise_p, shots):
-    qnn_margin, init_weights = _build_qnn(n_qubits, Xtr.shape[1], layers, noise_p, shots)
-    rng = np.random.default_rng(7)
+class _TrajectoryQNN:
+    """
+    Same circuit as _build_qnn, simulated as an ensemble of pure states.
+    Each DepolarizingChannel(p) becomes a sampled Pauli (I w.p. 1-p, X/Y/Z w.p. p/3),
+    so cost is trajectories x 2^n instead of 4^n; <Z0> is the ensemble mean.
+    Every trajectory is a unitary circuit, so gradients use the adjoint method
+    (one forward + one backward sweep) instead of 2 evaluations per parameter.
+    """
+    def __init__(self, n_qubits: int, layers: int, noise_p: float, trajectories: int,
+                 seed: int = 11, max_amplitudes: int = 2 ** 22):
+        self.n_qubits, self.layers, self.noise_p = n_qubits, layers, noise_p
+        self.T = max(2, int(trajectories))
+        self.rng = np.random.default_rng(seed)
+        # rows per simulation chunk so one chunk holds <= max_amplitudes amplitudes
+        self.chunk = max(1, max_amplitudes // (self.T * 2 ** n_qubits))
+
+    def sample_errors(self, n_rows: int) -> np.ndarray:
+        """Pauli codes (n_rows * T, layers, n_qubits): 0=I, 1=X, 2=Y, 3=Z."""
+        shape = (n_rows * self.T, self.layers, self.n_qubits)
+        if not self.noise_p:
+            return np.zeros(shape, dtype=np.int8)
+        p = self.noise_p
+        return self.rng.choice(4, size=shape, p=[1 - p, p / 3, p / 3, p / 3]).astype(np.int8)
+
+    def _tape(self, A: np.ndarray, thetas: np.ndarray, codes: np.ndarray, split_rot: bool = False):
+        """
+        Gate list for one chunk. With split_rot, Rot becomes RZ(phi) RY(theta) RZ(omega)
+        so each angle has a generator for the adjoint pass; otherwise it is one fused gate.
+        """
+        Ab = np.repeat(A, self.T, axis=0)
+        ry = [sv.ry_matrices(Ab[:, q]) for q in range(self.n_qubits)]
+        tape = []
+        for l in range(self.layers):
+            for q in range(self.n_qubits):
+                tape.append(("u", q, ry[q], None))
+            tape.append(("cnots", None, None, None))
+            for q in range(self.n_qubits):
+                phi, theta, omega = thetas[l, q]
+                if not split_rot:
+                    tape.append(("u", q, sv.rot_matrix(phi, theta, omega), None))
+                    continue
+                tape.append(("u", q, _rz(phi), ("Z", (l, q, 0))))
+                tape.append(("u", q, sv.ry_matrices(np.array([theta]))[0], ("Y", (l, q, 1))))
+                tape.append(("u", q, _rz(omega), ("Z", (l, q, 2))))
+            if self.noise_p:
+                for q in range(self.n_qubits):
+                    tape.append(("pauli", q, codes[:, l, q], None))
+        return tape
+
+    def _apply(self, state, op, inverse: bool = False):
+        kind, q, arg, _ = op
+        if kind == "u":
+            U = np.conj(np.swapaxes(arg, -1, -2)) if inverse else arg
+            return sv.apply_1q(state, U, q)
+        if kind == "cnots":
+            if inverse:
+                for c in reversed(range(self.n_qubits - 1)):
+                    state = sv.apply_cnot(state, c, c + 1)
+                return state
+            return sv.apply_cnot_chain(state, self.n_qubits)
+        return sv.apply_paulis(state, arg, q)  # Paulis are self-inverse
+
+    def _forward(self, A, thetas, codes, split_rot: bool = False):
+        tape = self._tape(A, thetas, codes, split_rot)
+        state = sv.zero_state(len(A) * self.T, self.n_qubits)
+        for op in tape:
+            state = self._apply(state, op)
+        return state, tape
+
+    def margins(self, A: np.ndarray, thetas: np.ndarray, codes: Optional[np.ndarray] = None):
+        """Returns (mean <Z0>, standard error) per row."""
+        codes = self.sample_errors(len(A)) if codes is None else codes
+        z = np.empty((len(A), self.T))
+        for i in range(0, len(A), self.chunk):
+            state, _ = self._forward(A[i:i+self.chunk], thetas, codes[i*self.T:(i+self.chunk)*self.T])
+            z[i:i+self.chunk] = sv.expval_z(state, 0).reshape(-1, self.T)
+        return z.mean(axis=1), z.std(axis=1, ddof=1) / np.sqrt(self.T)
+
+    def loss_grad(self, A: np.ndarray, y_pm: np.ndarray, thetas: np.ndarray,
+                  codes: Optional[np.ndarray] = None):
+        """MSE loss on the trajectory-mean margin and its exact gradient for this error sample."""
+        codes = self.sample_errors(len(A)) if codes is None else codes
+        n = len(A)
+        grad = np.zeros_like(thetas, dtype=float)
+        loss = 0.0
+        for i in range(0, n, self.chunk):
+            state, tape = self._forward(A[i:i+self.chunk], thetas, codes[i*self.T:(i+self.chunk)*self.T],
+                                        split_rot=True)
+            f = sv.expval_z(state, 0).reshape(-1, self.T).mean(axis=1)
+            resid = f - y_pm[i:i+self.chunk]
+            loss += float(np.sum(resid ** 2)) / n
+            # d loss / d <Z0>_trajectory, folded into the backward state
+            w = np.repeat(2.0 * resid / (n * self.T), self.T).reshape((-1,) + (1,) * self.n_qubits)
+            lam = sv.apply_1q(state, _PAULI_Z, 0) * w
+            for op in reversed(tape):
+                gen = op[3]
+                if gen is not None:
+                    g_name, idx = gen
+                    G = _PAULI_Z if g_name == "Z" else _PAULI_Y
+                    # d<O>/dx = Im <lam| G |psi> for a gate exp(-i x G / 2)
+                    grad[idx] += float(np.imag(np.vdot(lam, sv.apply_1q(state, G, op[1]))))
+                state = self._apply(state, op, inverse=True)
+                lam = self._apply(lam, op, inverse=True)
+        return loss, grad
+
+def _head_rngs(warm: Optional[Dict], c: int):
+    """(minibatch RNG, noise RNG) of head `c`: fresh streams, or where a checkpoint left them."""
+    rng, noise_rng = np.random.default_rng([7, c]), np.random.default_rng([11, c])
+    if warm:
+        rng.bit_generator.state = warm["rng"][c]
+        if "noise_rng" in warm:
+            noise_rng.bit_generator.state = warm["noise_rng"][c]
+    return rng, noise_rng
+
+def _train_ovr_trajectory(Atr, ytr, n_classes, epochs, lr, n_qubits, layers, noise_p,
+                          trajectories, to_angles, info: Dict,
+                          warm: Optional[Dict] = None, state_out: Optional[Dict] = None):
+    qnn = _TrajectoryQNN(n_qubits, layers, noise_p, trajectories)
+    init_rng = np.random.default_rng(7)
+    heads, rngs, noise_rngs = {}, {}, {}
+    n = len(Atr)
+    for c in range(n_classes):
+        y_pm = np.where(ytr == c, 1.0, -1.0)
+        weights = init_rng.normal(scale=0.15, size=(layers, n_qubits, 3))
+        # one minibatch stream and one error stream per head, so a resumed head continues its own
+        rng, qnn.rng = _head_rngs(warm, c)
+        if warm:
+            weights = np.array(warm["heads"][c])
+        for _ in range(epochs):
+            idx = rng.choice(n, size=min(32, n), replace=False)
+            _, grad = qnn.loss_grad(Atr[idx], y_pm[idx], weights)
+            weights = weights - lr * grad
+        heads[c] = weights
+        rngs[c], noise_rngs[c] = rng.bit_generator.state, qnn.rng.bit_generator.state
+    if state_out is not None:
+        state_out.update({"heads": {c: np.array(w) for c, w in heads.items()},
+                          "rng": rngs, "noise_rng": noise_rngs})
+
+    def predict(Xte):
+        Ate = to_angles(Xte)
+        scores, errs = [], []
+        for c in range(n_classes):
+            f, se = qnn.margins(Ate, heads[c])
+            scores.append(f.reshape(-1, 1)); errs.append(se)
+        E = np.vstack(errs)
+        info.update({"noise_model": "trajectory", "trajectories": qnn.T,
+                     "expval_stderr_mean": float(E.mean()), "expval_stderr_max": float(E.max())})
+        S = np.hstack(scores)
+        eS = np.exp(S)
+        return eS / eS.sum(axis=1, keepdims=True)
+    return predict
+
+def _train_ovr(Xtr, ytr, n_classes, epochs, lr, n_qubits, layers, noise_p, shots,
+               reducer: str = "random", reducer_options: Optional[Dict] = None,
+               noise_model: str = "mixed", trajectories: int = 64, info: Optional[Dict] = None,
+               warm: Optional[Dict] = None, state_out: Optional[Dict] = None):
+    """
+    Trains `epochs` steps per one-vs-rest head. `warm` is a state previously written to
+    `state_out` (head weights + each head's RNG state) to continue from instead of a fresh
+    init, so N epochs then M more trains exactly like N+M in one run.
+    """
+    if noise_model not in NOISE_MODELS:
+        raise ValueError(f"Unknown noise_model '{noise_model}'. Available: {list(NOISE_MODELS)}")
+    info = {} if info is None else info
+    proj, _ = fit_reducer(reducer, Xtr, n_qubits, options=reducer_options)
+    Atr = _to_angles(proj.transform(Xtr))
+    if noise_model == "trajectory":
+        # shots are not sampled here; the reported stderr is the trajectory error
+        return _train_ovr_trajectory(Atr, ytr, n_classes, epochs, lr, n_qubits, layers, noise_p,
+                                     trajectories, lambda X: _to_angles(proj.transform(X)), info,
+                                     warm=warm, state_out=state_out)
+
+    qnn_margin, init_weights = _build_qnn(n_qubits, layers, noise_p, shots)
 
     def to_margins(weights, X): return pnp.array([qnn_margin(x, weights) for x in X])
     def loss_mse(weights, X, y_pm): return pnp.mean((to_margins(weights, X) - y_pm)**2)
 
-    heads = {}
+    heads, rngs = {}, {}
     for c in range(n_classes):
         y_pm = pnp.array(np.where(ytr == c, +1, -1))
         weights = init_weights()
+        rng, _ = _head_rngs(warm, c)
+        if warm:
+            weights = pnp.array(warm["heads"][c], requires_grad=True)
         opt = qml.GradientDescentOptimizer(stepsize=lr)
         n = len(Xtr)
         for _ in range(epochs):
             idx = rng.choice(n, size=min(32, n), replace=False)
-            weights, _ = opt.step_and_cost(lambda w: loss_mse(w, Xtr[idx], y_pm[idx]), weights)
+            weights, _ = opt.step_and_cost(lambda w: loss_mse(w, Atr[idx], y_pm[idx]), weights)
         heads[c] = weights
+        rngs[c] = rng.bit_generator.state
+    if state_out is not None:
+        state_out.update({"heads": {c: np.array(w) for c, w in heads.items()}, "rng": rngs})
 
     def predict(Xte):
+        Ate = _to_angles(proj.transform(Xte))
         scores = []
         for c in range(n_classes):
-            f = np.array([qnn_margin(x, heads[c]) for x in Xte], dtype=float).reshape(-1,1)
+            f = np.array([qnn_margin(a, heads[c]) for a in Ate], dtype=float).reshape(-1,1)
             scores.append(f)
         S = np.hstack(scores)
         eS = np.exp(S)  # softmax temperature=1
@@ -69,10 +258,41 @@ def run_vqc_ovr(Xtr, ytr, Xte, params: Dict, classes: List[str]) -> Tuple[np.nda
     epochs = int(params.get("epochs", 50))
     lr = float(params.get("lr", 0.08))
     n_qubits = int(params.get("n_qubits", 2))
+    reducer = str(params.get("reducer") or "random")
+    noise_model = str(params.get("noise_model") or "mixed")
+    trajectories = int(params.get("trajectories", 64))
+
+    config = {"shots": shots, "noise_prob": noise_p, "layers": layers, "lr": lr, "n_qubits": n_qubits,
+              "reducer": reducer, "noise_model": noise_model, "trajectories": trajectories}
+    plan = plan_resume("vqc_ovr", Xtr, ytr, config, epochs, params)
 
     t0 = time.perf_counter()
-    predict = _train_ovr(Xtr, ytr, n_classes=len(set(ytr)), epochs=epochs, lr=lr,
-                         n_qubits=n_qubits, layers=layers, noise_p=noise_p, shots=shots)
+    info: Dict = {}
+    state: Dict = {}
+    predict = _train_ovr(Xtr, ytr, n_classes=len(set(ytr)), epochs=plan.epochs_to_train, lr=lr,
+                         n_qubits=n_qubits, layers=layers, noise_p=noise_p, shots=shots,
+                         reducer=reducer, noise_model=noise_model, trajectories=trajectories, info=info,
+                         warm=plan.state, state_out=state)
+    ckpt_id = save_checkpoint(plan, state)
+    train_ms = (time.perf_counter() - t0) * 1000.0
+    t1 = time.perf_counter()
     proba = predict(Xte)
-    total_ms = (time.perf_counter() - t0) * 1000.0
-    return proba, {"train_ms": total_ms, "infer_ms": 0.0}, {}
+    infer_ms = (time.perf_counter() - t1) * 1000.0
+    extras = {"reducer": reducer, "noise_model": noise_model} | info | resume_extras(plan, ckpt_id)
+    return proba, {"train_ms": train_ms, "infer_ms": infer_ms}, extras
+
+def validate_trajectories(n_qubits: int = 2, layers: int = 2, noise_p: float = 0.1,
+                          n_samples: int = 8, trajectories: int = 4000, seed: int = 0) -> Dict:
+    """
+    Check the trajectory simulator against default.mixed on random inputs/weights.
+    Each row's |error| should sit within a few standard errors.
+    """
+    rng = np.random.default_rng(seed)
+    A = rng.uniform(-np.pi, np.pi, size=(n_samples, n_qubits))
+    thetas = rng.normal(size=(layers, n_qubits, 3))
+    qnn_margin, _ = _build_qnn(n_qubits, layers, noise_p, None)
+    exact = np.array([float(qnn_margin(a, thetas)) for a in A])
+    mean, se = _TrajectoryQNN(n_qubits, layers, noise_p, trajectories, seed=seed).margins(A, thetas)
+    z = np.abs(mean - exact) / np.maximum(se, 1e-12)
+    return {"max_abs_err": float(np.abs(mean - exact).max()), "max_stderr": float(se.max()),
+            "max_z": float(z.max()), "within_4_sigma": bool((z < 4).all())}
@@ -0,0 +1,6 @@
+# backend/tests/conftest.py
+import os
+import sys
+
+# modules import as `core.*` / `models.*` relative to backend/, as when running uvicorn there
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,131 @@
+# backend/tests/test_admission.py
+import io
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from core.admission import Admission, FamilyGate, admitted
+from core.tournament import run_tournament
+
+CLASSES = ["0", "1"]
+
+
+def _slow_runner(seconds, calls=None):
+    def run(Xtr, ytr, Xte, params, classes):
+        if calls is not None:
+            calls.append(threading.current_thread().name)
+        time.sleep(seconds)
+        return np.full((len(Xte), len(classes)), 1.0 / len(classes)), {"train_ms": seconds * 1000.0}, {}
+    return run
+
+
+def _admission(quantum_limit, timeout, quantum_queue=8):
+    return Admission({"classical": FamilyGate("classical", 4, 16, timeout),
+                      "quantum": FamilyGate("quantum", quantum_limit, quantum_queue, timeout)})
+
+
+def test_tournament_entries_do_not_time_out_behind_siblings(monkeypatch):
+    monkeypatch.setenv("QML_TOURNAMENT_MAX_WORKERS", "3")
+    adm = _admission(quantum_limit=1, timeout=0.2)
+    resolve = lambda family, model: admitted(adm, family, _slow_runner(0.3))
+    entries = [{"family": "quantum", "model": m, "params": {}} for m in ("qnn", "vqc", "qnn_simple")]
+    entries.append({"family": "classical", "model": "logreg", "params": {}})
+    X, y = np.zeros((8, 2)), np.array([0, 1] * 4)
+
+    result = run_tournament(entries, X, y, X, y, CLASSES, max_workers=3, resolve=resolve,
+                            family_limits={f: g.limit for f, g in adm.gates.items()})
+
+    assert [row.get("error") for row in result["leaderboard"]] == [None] * 4
+    assert adm.gates["quantum"].stats()["rejected_timeout"] == 0
+    # the classical entry is not stuck behind the serialized quantum ones
+    classical = next(r for r in result["leaderboard"] if r["family"] == "classical")
+    assert classical["queue_wait_ms"] < 200
+
+
+def test_tournament_without_family_limits_still_runs_everything(monkeypatch):
+    monkeypatch.setenv("QML_TOURNAMENT_MAX_WORKERS", "2")
+    entries = [{"family": "quantum", "model": f"m{i}", "params": {}} for i in range(3)]
+    X, y = np.zeros((4, 2)), np.array([0, 1, 0, 1])
+    result = run_tournament(entries, X, y, X, y, CLASSES, resolve=lambda f, m: _slow_runner(0.01))
+    assert len(result["leaderboard"]) == 3 and result["max_workers"] == 2
+    assert all("metrics" in row for row in result["leaderboard"])
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    from fastapi.testclient import TestClient
+    monkeypatch.setenv("QML_RUNSTORE_PATH", str(tmp_path / "runs.sqlite3"))
+    monkeypatch.setenv("QML_ESTIMATE_CALIBRATE", "0")
+    import main
+    with TestClient(main.app) as c:
+        yield c, main
+
+
+def test_compare_rejects_before_training_classical(client, monkeypatch):
+    c, main = client
+    adm = _admission(quantum_limit=1, timeout=0.2, quantum_queue=0)
+    monkeypatch.setattr(main, "ADMISSION", adm)
+    calls = []
+    monkeypatch.setattr(main, "get_classical_runner", lambda key: _slow_runner(0.0, calls))
+    monkeypatch.setattr(main, "get_quantum_runner", lambda key: _slow_runner(0.0))
+    rng = np.random.default_rng(0)
+    rows = "\n".join(f"{a:.1f},{b:.1f},{int(a > 0)}" for a, b in rng.normal(size=(40, 2)))
+    files = {"file": ("d.csv", io.BytesIO(f"x1,x2,label\n{rows}\n".encode()), "text/csv")}
+    data = {"classicalModel": "logreg", "quantumModel": "vqc", "targetColumn": "label"}
+
+    # another request holds the only quantum slot and nothing may queue: the capacity check
+    # rejects before classical trains
+    with adm.gates["quantum"].slot():
+        resp = c.post("/api/compare", files=files, data=data)
+    assert resp.status_code == 429
+    assert "Retry-After" in resp.headers
+    assert calls == []
+
+    files["file"][1].seek(0)
+    resp = c.post("/api/compare", files=files, data=data)
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["admission"]["quantum"]["family"] == "quantum"
+    assert adm.gates["quantum"].stats()["active"] == 0
+
+
+def test_compare_quantum_timeout_is_429(client, monkeypatch):
+    c, main = client
+    adm = _admission(quantum_limit=1, timeout=0.2)
+    monkeypatch.setattr(main, "ADMISSION", adm)
+    monkeypatch.setattr(main, "get_classical_runner", lambda key: _slow_runner(0.0))
+    monkeypatch.setattr(main, "get_quantum_runner", lambda key: _slow_runner(0.0))
+    rows = "\n".join(f"{i % 7}.5,{i % 3}.5,{i % 2}" for i in range(40))
+    files = {"file": ("d.csv", io.BytesIO(f"x1,x2,label\n{rows}\n".encode()), "text/csv")}
+    data = {"classicalModel": "logreg", "quantumModel": "vqc", "targetColumn": "label"}
+    with adm.gates["quantum"].slot():  # queue has room, but the slot stays busy past the timeout
+        resp = c.post("/api/compare", files=files, data=data)
+    assert resp.status_code == 429
+    assert "Retry-After" in resp.headers
+
+
+def test_compares_share_classical_while_quantum_is_busy(client, monkeypatch):
+    c, main = client
+    adm = _admission(quantum_limit=1, timeout=10.0)
+    monkeypatch.setattr(main, "ADMISSION", adm)
+    calls = []
+    monkeypatch.setattr(main, "get_classical_runner", lambda key: _slow_runner(0.5, calls))
+    monkeypatch.setattr(main, "get_quantum_runner", lambda key: _slow_runner(0.2))
+    rows = "\n".join(f"{i % 7}.5,{i % 3}.5,{i % 2}" for i in range(40))
+    body = f"x1,x2,label\n{rows}\n".encode()
+    out = {}
+
+    def post(i):
+        data = {"classicalModel": "logreg", "quantumModel": "vqc", "targetColumn": "label",
+                "quantumParams": f'{{"layers": {i + 1}}}'}
+        out[i] = c.post("/api/compare", files={"file": ("d.csv", io.BytesIO(body), "text/csv")}, data=data)
+
+    threads = [threading.Thread(target=post, args=(i,)) for i in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert [out[i].status_code for i in range(3)] == [200] * 3
+    assert len(calls) == 1  # one classical training, shared by all three
+    assert sum(out[i].json()["coalesced"]["classical"] for i in range(3)) == 2
@@ -0,0 +1,28 @@
+# backend/tests/test_cache.py
+import numpy as np
+
+from core.cache import LRUCache
+
+
+def test_byte_cap_evicts_oldest_and_skips_oversized_values():
+    cache = LRUCache(maxsize=16, max_bytes=3000)
+    for k in "abc":
+        cache.put(k, np.zeros(125))  # 1000 bytes each
+    assert len(cache) == 3 and cache.nbytes == 3000
+    cache.get("a")  # 'b' is now least recently used
+    cache.put("d", np.zeros(125))
+    assert cache.get("b") is None and cache.get("a") is not None
+    assert cache.nbytes == 3000
+
+    cache.put("big", np.zeros(1000))  # 8000 bytes: never stored, nothing evicted for it
+    assert cache.get("big") is None and len(cache) == 3
+
+    cache.put("a", np.zeros(250))  # replacing a key re-counts its size
+    assert cache.nbytes <= 3000 and cache.get("a").size == 250
+
+
+def test_count_cap_unchanged_without_max_bytes():
+    cache = LRUCache(maxsize=2)
+    for k in range(3):
+        cache.put(k, np.zeros(10 ** 6))
+    assert len(cache) == 2 and cache.get(0) is None
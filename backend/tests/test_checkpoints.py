@@ -0,0 +1,46 @@
+# backend/tests/test_checkpoints.py
+import numpy as np
+import pytest
+
+from core import checkpoints
+from core.cache import LRUCache
+from models.vqc_ovr import run_vqc_ovr
+
+CLASSES = ["a", "b", "c"]
+
+
+@pytest.fixture
+def split():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(60, 3))
+    y = np.argmax(X, axis=1)
+    return X[:48], y[:48], X[48:]
+
+
+@pytest.fixture(autouse=True)
+def fresh_store(monkeypatch):
+    monkeypatch.setattr(checkpoints, "_STORE", LRUCache(maxsize=2))
+
+
+@pytest.mark.parametrize("noise_model", ["trajectory", "mixed"])
+def test_resume_matches_one_run(split, noise_model):
+    Xtr, ytr, Xte = split
+    base = {"n_qubits": 2, "layers": 1, "noise_model": noise_model, "trajectories": 8}
+    run_vqc_ovr(Xtr, ytr, Xte, base | {"epochs": 2}, CLASSES)
+    resumed, _, extras = run_vqc_ovr(Xtr, ytr, Xte, base | {"epochs": 4, "resume_from": "auto"}, CLASSES)
+    straight, _, _ = run_vqc_ovr(Xtr, ytr, Xte, base | {"epochs": 4, "checkpoint": False}, CLASSES)
+    assert extras["epochs_reused"] == 2 and extras["epochs_trained"] == 2
+    np.testing.assert_allclose(resumed, straight)
+
+
+def test_auto_resume_forgets_evicted_checkpoints(split):
+    Xtr, ytr, Xte = split
+    base = {"n_qubits": 2, "layers": 1, "noise_model": "trajectory", "trajectories": 8}
+    run_vqc_ovr(Xtr, ytr, Xte, base | {"epochs": 1}, CLASSES)
+    # two other configurations push the first checkpoint out of the 2-entry store
+    run_vqc_ovr(Xtr, ytr, Xte, base | {"epochs": 1, "lr": 0.1}, CLASSES)
+    run_vqc_ovr(Xtr, ytr, Xte, base | {"epochs": 1, "lr": 0.2}, CLASSES)
+    assert len(checkpoints._STORE) == 2
+    _, _, extras = run_vqc_ovr(Xtr, ytr, Xte, base | {"epochs": 2, "resume_from": "auto"}, CLASSES)
+    assert extras["epochs_reused"] == 0
+    assert extras["resume_note"] == "no checkpoint for this configuration"
@@ -0,0 +1,32 @@
+# backend/tests/test_estimate.py
+import pytest
+
+from core.estimate import Estimator, Shape
+
+
+def _runs(est, model, train_x, infer_x, n=3):
+    shape = Shape.from_rows(500, 6, 3)
+    pred = est.estimate("classical", model, shape, {}, corrected=False)
+    timings = {"train_ms": pred["train_s"] * 1000.0 * train_x, "infer_ms": pred["infer_s"] * 1000.0 * infer_x}
+    return [{"n_samples": 500, "n_features": 6, "n_classes": 3,
+             "models": [{"family": "classical", "model": model, "params": {}, "timings": timings}]}] * n
+
+
+def test_train_and_infer_corrections_fit_separately():
+    est = Estimator()
+    est.calibrate_from_runs(_runs(est, "rf", train_x=4.0, infer_x=0.5))
+    assert est.corrections["rf"] == pytest.approx(4.0)
+    assert est.infer_corrections["rf"] == pytest.approx(0.5)
+
+    raw = est.estimate("classical", "rf", Shape.from_rows(500, 6, 3), {}, corrected=False)
+    got = est.estimate("classical", "rf", Shape.from_rows(500, 6, 3), {})
+    assert got["train_s"] == pytest.approx(raw["train_s"] * 4.0)
+    assert got["infer_s"] == pytest.approx(raw["infer_s"] * 0.5)
+
+
+def test_untimed_inference_leaves_infer_estimate_alone():
+    est = Estimator()
+    est.calibrate_from_runs(_runs(est, "rf", train_x=3.0, infer_x=0.0))
+    assert est.corrections["rf"] == pytest.approx(3.0)
+    assert "rf" not in est.infer_corrections
+    assert est.estimate("classical", "rf", Shape.from_rows(500, 6, 3), {})["infer_correction"] == 1.0
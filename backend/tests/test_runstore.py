@@ -0,0 +1,25 @@
+# backend/tests/test_runstore.py
+from core.runstore import RunStore
+
+INFO = {"target": "label", "n_samples": 10, "n_features": 2, "classes": ["a", "b"]}
+
+
+def _model(metrics):
+    return {"family": "classical", "model": "logreg", "params": {}, "metrics": metrics,
+            "timings": {"train_ms": 1.0}}
+
+
+def test_bad_run_does_not_drop_its_batch(tmp_path, caplog):
+    store = RunStore(str(tmp_path / "runs.sqlite3"))
+    ok = [store.record("compare", f"h{i}", INFO, [_model({"accuracy": 0.5})]) for i in range(5)]
+    bad = store.record("compare", "bad", INFO, [_model({"accuracy": object()})])  # not JSON-serializable
+    ok += [store.record("compare", f"h{i}", INFO, [_model({"accuracy": 0.5})]) for i in range(5, 10)]
+    store.close()  # drains the queue before stopping the writer
+
+    reopened = RunStore(str(tmp_path / "runs.sqlite3"))
+    try:
+        stored = {r["run_id"] for r in reopened.list_runs(limit=100)["items"]}
+    finally:
+        reopened.close()
+    assert stored == set(ok)
+    assert f"dropped run {bad}" in caplog.text
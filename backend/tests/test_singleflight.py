@@ -0,0 +1,32 @@
+# backend/tests/test_singleflight.py
+import threading
+import time
+
+import numpy as np
+
+from core.admission import Admission, FamilyGate, admitted
+from core.singleflight import SingleFlight, coalesced
+
+
+def test_followers_do_not_inherit_the_leaders_admission_ticket():
+    adm = Admission({"quantum": FamilyGate("quantum", 1, 4, 5.0)})
+    started = threading.Event()
+
+    def slow(Xtr, ytr, Xte, params, classes):
+        started.set()
+        time.sleep(0.3)
+        return np.zeros((len(Xte), 2)), {"train_ms": 300.0}, {}
+
+    run = coalesced(SingleFlight(), "quantum", "vqc", admitted(adm, "quantum", slow))
+    X, y = np.zeros((4, 2)), np.array([0, 1, 0, 1])
+    out = {}
+    leader = threading.Thread(target=lambda: out.setdefault("leader", run(X, y, X, {}, ["0", "1"])))
+    leader.start()
+    started.wait(5)
+    out["follower"] = run(X, y, X, {}, ["0", "1"])
+    leader.join()
+
+    assert "admission" in out["leader"][2] and "coalesced" not in out["leader"][2]
+    assert out["follower"][2].get("coalesced") is True
+    assert "admission" not in out["follower"][2]
+    assert adm.gates["quantum"].stats()["admitted"] == 1
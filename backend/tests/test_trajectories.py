@@ -0,0 +1,28 @@
+# backend/tests/test_trajectories.py
+import numpy as np
+
+from models.vqc_ovr import _TrajectoryQNN, validate_trajectories
+
+
+def test_trajectories_match_default_mixed():
+    report = validate_trajectories(n_qubits=2, layers=2, noise_p=0.1, n_samples=8, trajectories=4000)
+    assert report["within_4_sigma"], report
+
+
+def test_adjoint_gradient_matches_finite_differences():
+    rng = np.random.default_rng(3)
+    qnn = _TrajectoryQNN(n_qubits=3, layers=2, noise_p=0.1, trajectories=16, seed=5)
+    A = rng.uniform(-np.pi, np.pi, size=(6, 3))
+    y_pm = rng.choice([-1.0, 1.0], size=6)
+    thetas = rng.normal(size=(2, 3, 3))
+    codes = qnn.sample_errors(len(A))  # fixed error sample: the loss is then a smooth function
+
+    _, grad = qnn.loss_grad(A, y_pm, thetas, codes)
+    h = 1e-6
+    fd = np.zeros_like(thetas)
+    for idx in np.ndindex(thetas.shape):
+        up, down = thetas.copy(), thetas.copy()
+        up[idx] += h
+        down[idx] -= h
+        fd[idx] = (qnn.loss_grad(A, y_pm, up, codes)[0] - qnn.loss_grad(A, y_pm, down, codes)[0]) / (2 * h)
+    np.testing.assert_allclose(grad, fd, atol=1e-7)
@@ -0,0 +1,98 @@
+# backend/tests/test_workers.py
+import json
+import time
+import urllib.request
+
+import numpy as np
+import pytest
+
+from core.workers import JobTimeout, RemoteRunnerError, WorkerPool, spawn_local_workers
+
+CLASSES = ["0", "1"]
+
+
+@pytest.fixture(scope="module")
+def workers():
+    procs, urls = spawn_local_workers(2, base_port=9171, wait_s=120.0)
+    yield procs, urls
+    for p in procs:
+        p.kill()
+        p.wait()
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(120, 4))
+    y = (X[:, 0] > 0).astype(int)
+    return X[:100], y[:100], X[100:]
+
+
+def _health(url):
+    with urllib.request.urlopen(f"{url}/health", timeout=5) as r:
+        return json.loads(r.read())
+
+
+def test_dispatch_returns_runner_output(workers, data):
+    _, urls = workers
+    pool = WorkerPool(urls, health_interval=60.0)
+    try:
+        Xtr, ytr, Xte = data
+        proba, timings, extras = pool.run("classical", "logreg", Xtr, ytr, Xte, {"C": 1.0}, CLASSES)
+        assert proba.shape == (len(Xte), 2)
+        assert np.allclose(proba.sum(axis=1), 1.0)
+        assert "train_ms" in timings
+        assert sum(_health(u)["completed"] for u in urls) >= 1
+    finally:
+        pool.close()
+
+
+def test_runner_error_propagates_without_retry(workers, data):
+    _, urls = workers
+    pool = WorkerPool(urls, health_interval=60.0)
+    try:
+        Xtr, ytr, Xte = data
+        failed_before = sum(_health(u)["failed"] for u in urls)
+        with pytest.raises(RemoteRunnerError):
+            pool.run("classical", "logreg", Xtr, ytr, Xte, {"C": "not-a-number"}, CLASSES)
+        assert sum(_health(u)["failed"] for u in urls) == failed_before + 1
+        assert all(s["healthy"] for s in pool.status())
+    finally:
+        pool.close()
+
+
+def test_job_timeout_is_not_redispatched(workers):
+    _, urls = workers
+    pool = WorkerPool(urls, job_timeout=0.3, health_interval=60.0)
+    try:
+        rng = np.random.default_rng(1)
+        X = rng.normal(size=(3000, 8))
+        y = (X[:, 0] > 0).astype(int)
+        with pytest.raises(JobTimeout):
+            pool.run("classical", "rf", X, y, X[:10], {"n_estimators": 3000, "n_jobs": 1}, CLASSES)
+        # exactly one worker got the job, and neither is marked lost for being slow
+        time.sleep(0.3)
+        assert sorted(_health(u)["inflight"] for u in urls) == [0, 1]
+        assert all(s["healthy"] and s["failures"] == 0 for s in pool.status())
+    finally:
+        pool.close()
+
+
+def test_failover_after_worker_killed(workers, data):
+    procs, urls = workers
+    # least-loaded dispatch picks the first idle worker; kill it so the job has to move
+    idle = [i for i, u in enumerate(urls) if _health(u)["inflight"] == 0]
+    victim = idle[0]
+    procs[victim].kill()
+    procs[victim].wait()
+    order = [urls[victim]] + [u for i, u in enumerate(urls) if i != victim]
+    pool = WorkerPool(order, health_interval=60.0)
+    try:
+        Xtr, ytr, Xte = data
+        proba, _, _ = pool.run("classical", "logreg", Xtr, ytr, Xte, {}, CLASSES)
+        assert proba.shape == (len(Xte), 2)
+        status = {s["url"]: s for s in pool.status()}
+        assert not status[urls[victim]]["healthy"]
+        assert status[urls[victim]]["failures"] == 1
+    finally:
+        pool.close()
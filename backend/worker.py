@@ -0,0 +1,132 @@
+# backend/worker.py
+"""
+Standalone simulation worker.
+
+    python worker.py --port 9101 --slots 1
+    QML_WORKER_TOKEN=secret python worker.py --host 0.0.0.0 --port 9101
+
+Point the API at one or more workers with QML_WORKERS=host:port,host:port.
+Workers listen on 127.0.0.1 by default. Binding any other address requires a shared
+token (--token or QML_WORKER_TOKEN); the API sends the same QML_WORKER_TOKEN.
+"""
+from __future__ import annotations
+
+import argparse
+import hmac
+import ipaddress
+import json
+import os
+import threading
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.registry import get_classical_runner, get_quantum_runner
+from core.workers import decode_job, encode_result
+
+_RESOLVERS = {"classical": get_classical_runner, "quantum": get_quantum_runner}
+
+
+class WorkerState:
+    def __init__(self, slots: int, token: str | None = None):
+        self.token = token
+        self.slots = threading.BoundedSemaphore(max(1, slots))
+        self.lock = threading.Lock()
+        self.inflight = 0
+        self.completed = 0
+        self.failed = 0
+
+
+def make_handler(state: WorkerState):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: bytes, ctype: str):
+            self.send_response(status)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _json(self, status: int, obj):
+            self._send(status, json.dumps(obj).encode(), "application/json")
+
+        def do_GET(self):
+            if self.path != "/health":
+                return self._json(404, {"error": "not found"})
+            with state.lock:
+                info = {"ok": True, "pid": os.getpid(), "inflight": state.inflight,
+                        "completed": state.completed, "failed": state.failed}
+            self._json(200, info)
+
+        def _authorized(self) -> bool:
+            if not state.token:
+                return True
+            sent = self.headers.get("Authorization", "")
+            return hmac.compare_digest(sent.encode(), f"Bearer {state.token}".encode())
+
+        def do_POST(self):
+            if self.path != "/run":
+                return self._json(404, {"error": "not found"})
+            length = int(self.headers.get("Content-Length", 0))
+            body = self.rfile.read(length)  # read even when refusing, so the client sees the 401
+            if not self._authorized():
+                return self._json(401, {"error": "missing or wrong worker token"})
+            with state.lock:
+                state.inflight += 1
+            try:
+                try:
+                    family, model, Xtr, ytr, Xte, params, classes = decode_job(body)
+                    runner = _RESOLVERS[family](model)
+                except Exception as e:
+                    return self._json(400, {"error": f"bad job: {e}"})
+                with state.slots:
+                    try:
+                        proba, timings, extras = runner(Xtr, ytr, Xte, params, classes)
+                    except Exception as e:
+                        traceback.print_exc()
+                        with state.lock:
+                            state.failed += 1
+                        return self._json(422, {"error": f"{type(e).__name__}: {e}"})
+                with state.lock:
+                    state.completed += 1
+                self._send(200, encode_result(proba, timings, extras), "application/octet-stream")
+            finally:
+                with state.lock:
+                    state.inflight -= 1
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def main():
+    ap = argparse.ArgumentParser(description="QML Compare simulation worker")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=9101)
+    ap.add_argument("--slots", type=int, default=1, help="jobs run concurrently; extra jobs wait")
+    ap.add_argument("--token", default=os.environ.get("QML_WORKER_TOKEN"),
+                    help="shared secret required on /run (default: QML_WORKER_TOKEN)")
+    args = ap.parse_args()
+    if not args.token and not _is_loopback(args.host):
+        ap.error(f"binding {args.host} accepts jobs from the network; set --token or QML_WORKER_TOKEN")
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(WorkerState(args.slots, args.token)))
+    print(f"worker listening on http://{args.host}:{args.port} (slots={args.slots})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
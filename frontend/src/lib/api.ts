@@ -20,6 +20,10 @@ export async function compareModels(
   form.append('targetColumn', payload.targetColumn)
 
   const res = await fetch(`${API_BASE}/api/compare`, { method: 'POST', body: form })
+  if (res.status === 429) {
+    const wait = res.headers.get('Retry-After')
+    throw new Error(`Server is busy with other runs${wait ? `; try again in ${wait}s` : ''}.`)
+  }
   if (!res.ok) throw new Error(`Compare failed: ${res.status}`)
   return res.json()
 }
@@ -6,6 +6,9 @@ export const CLASSICAL_MODELS: Record<ClassicalModelKey, { name: string; short:
   rf:  { name: 'Random Forest', short: 'Trees ensemble', explain: 'Many trees averaged; gives feature importances.' },
   logreg: { name: 'Logistic Regression', short: 'Linear baseline', explain: 'Fast linear classifier, interpretable coefficients.' },
   mlp_torch: { name: 'MLP (PyTorch)', short: 'Dense NN (torch)', explain: 'Two-layer MLP trained with Adam (requires torch).' },
+  sgd_logreg: { name: 'Logistic Regression (SGD)', short: 'Incremental linear', explain: 'Trained chunk by chunk with averaged SGD; scales to tables that do not fit in memory.' },
+  sgd_rbf: { name: 'Kernel approx. + SGD', short: 'Incremental RBF', explain: 'Random Fourier features approximate an RBF-kernel SVM; a linear SGD model trains on them chunk by chunk.' },
+  mlp_stream: { name: 'MLP (incremental)', short: 'Incremental NN', explain: 'One-hidden-layer network updated chunk by chunk with Adam.' },
 }
 
 export const QUANTUM_MODELS: Record<QuantumModelKey, { name: string; short: string; explain: string }> = {
@@ -14,6 +17,7 @@ export const QUANTUM_MODELS: Record<QuantumModelKey, { name: string; short: stri
   qnn_simple: { name: 'QNN (2-qubit simple)', short: 'Minimal circuit', explain: 'Simple 2-qubit circuit; uses first 2 features; OvR.' },
   hybrid_torch: { name: 'Hybrid QCNN (torch)', short: 'Torch + Pennylane', explain: 'AngleEmbedding + StronglyEntanglingLayers feeding a small head (requires torch).' },
   aec_qnn: { name: 'AEC → QNN', short: 'Autoencoder + VQC', explain: 'Keras autoencoder compresses features, then VQC trains on encoded space (requires tensorflow).' },
+  qsvm_kernel: { name: 'Quantum kernel SVM', short: 'Fidelity kernel', explain: 'Each row is embedded into a statevector once; an SVM trains on the state-overlap kernel.' },
 }
 
 export const METRIC_HELP: Record<string, string> = {
@@ -1,7 +1,7 @@
 // frontend/src/lib/types.ts
 
-export type ClassicalModelKey = 'mlp' | 'svm' | 'rf' | 'logreg' | 'mlp_torch'
-export type QuantumModelKey = 'qnn' | 'vqc' | 'qnn_simple' | 'hybrid_torch' | 'aec_qnn'
+export type ClassicalModelKey = 'mlp' | 'svm' | 'rf' | 'logreg' | 'mlp_torch' | 'sgd_logreg' | 'sgd_rbf' | 'mlp_stream'
+export type QuantumModelKey = 'qnn' | 'vqc' | 'qnn_simple' | 'hybrid_torch' | 'aec_qnn' | 'qsvm_kernel'
 
 export interface DatasetPreview {
   filename: string
@@ -53,6 +53,11 @@ export interface CompareResult {
     classical: { confusion: number[][], timings?: { train_ms: number, infer_ms: number } }
     quantum:   { confusion: number[][], timings?: { train_ms: number, infer_ms: number } }
   }
+  coalesced?: { request: boolean, classical: boolean, quantum: boolean }
+  admission?: {
+    classical?: { family: string, wait_ms: number, queue_depth: number, limit: number }
+    quantum?: { family: string, wait_ms: number, queue_depth: number, limit: number }
+  }
   notes?: string
 }
 
@@ -73,7 +78,22 @@ export interface QuickcheckRecommendation {
   quantum: QuantumModelKey
 }
 
+export interface CostEstimate {
+  family: 'classical' | 'quantum'
+  model: string
+  train_s: number
+  infer_s: number
+  total_s: number
+  peak_mb: number
+  basis: Record<string, unknown>
+  correction: number
+  params?: Record<string, unknown>
+  refused?: string | null
+  downscaled?: Record<string, { from: number, to: number }>
+}
+
 export interface QuickcheckResponse {
   analysis: QuickcheckAnalysisTabular // (extend if you add image/video)
   recommendation: QuickcheckRecommendation
+  estimate?: { classical?: CostEstimate, quantum?: CostEstimate, error?: string }
 }
@@ -34,6 +34,21 @@ const HELP: Record<string, string> = {
   ae_epochs: 'Training epochs for the autoencoder.',
   q_epochs: 'Training epochs for the quantum classifier.',
   q_lr: 'Learning rate for the quantum classifier.',
+  noise_model: 'mixed = exact density matrix (small circuits); trajectory = sampled Pauli errors on statevectors (scales to 10+ qubits).',
+  trajectories: 'Noise samples per input in trajectory mode; more = smaller statistical error.',
+  resume_from: '“auto” continues from the furthest checkpoint of the same dataset and settings, so only the extra epochs train. Or paste a checkpoint_id from an earlier run.',
+  alpha: 'L2 penalty of the SGD model. Larger = simpler model.',
+  n_components: 'Random Fourier features approximating the RBF kernel; more = closer to a kernel SVM, slower.',
+  hidden: 'Hidden units of the single-layer network.',
+  chunk_rows: 'Rows handed to the model per incremental update; bounds memory, not accuracy.',
+  reducer: 'How wide inputs are squeezed to the qubit count: slice, random, pca or autoencoder. Fitted once per dataset and cached.',
+}
+
+function fmtSeconds(s: number) {
+  if (s < 1) return '<1s'
+  if (s < 120) return `${Math.round(s)}s`
+  if (s < 7200) return `${Math.round(s / 60)} min`
+  return `${(s / 3600).toFixed(1)} h`
 }
 
 const FRIENDLY = {
@@ -54,6 +69,9 @@ const FAST_CLASSICAL: Record<ClassicalModelKey, Record<string, number | string>>
   rf:        { n_estimators: 150, max_depth: '' },
   logreg:    { C: 1.0 },
   mlp_torch: { epochs: 8, lr: 0.001, batch_size: 64 },
+  sgd_logreg: { epochs: 20, alpha: 0.0001, chunk_rows: 50000 },
+  sgd_rbf:    { epochs: 20, alpha: 0.0001, n_components: 300, gamma: 'scale', chunk_rows: 50000 },
+  mlp_stream: { epochs: 20, hidden: 64, lr: 0.003, batch_size: 256, chunk_rows: 50000 },
 }
 const FAST_QUANTUM: Record<QuantumModelKey, Record<string, number | string>> = {
   qnn:         { shots: 0, noise_prob: 0.0, layers: 2, epochs: 20, lr: 0.06, n_qubits: 2 },
@@ -61,6 +79,7 @@ const FAST_QUANTUM: Record<QuantumModelKey, Record<string, number | string>> = {
   qnn_simple:  { epochs: 15, lr: 0.08 },
   hybrid_torch:{ n_qubits: 4, layers: 1, epochs: 6,  lr: 0.001, batch_size: 32 },
   aec_qnn:     { encoding_dim: 4, ae_epochs: 8, batch_size: 32, q_epochs: 16, q_lr: 0.06, n_qubits: 4, layers: 2, noise_prob: 0.0, shots: 0 },
+  qsvm_kernel: { n_qubits: 4, layers: 2, C: 1.0 },
 }
 
 export default function Compare() {
@@ -85,6 +104,9 @@ export default function Compare() {
     rf: FAST_CLASSICAL.rf,
     logreg: FAST_CLASSICAL.logreg,
     mlp_torch: FAST_CLASSICAL.mlp_torch,
+    sgd_logreg: FAST_CLASSICAL.sgd_logreg,
+    sgd_rbf: FAST_CLASSICAL.sgd_rbf,
+    mlp_stream: FAST_CLASSICAL.mlp_stream,
   })
   const [qParamsByModel, setQParamsByModel] = useState<Record<QuantumModelKey, Record<string, number | string>>>({
     qnn: FAST_QUANTUM.qnn,
@@ -92,6 +114,7 @@ export default function Compare() {
     qnn_simple: FAST_QUANTUM.qnn_simple,
     hybrid_torch: FAST_QUANTUM.hybrid_torch,
     aec_qnn: FAST_QUANTUM.aec_qnn,
+    qsvm_kernel: FAST_QUANTUM.qsvm_kernel,
   })
 
   const cParams = cParamsByModel[classical]
@@ -254,6 +277,23 @@ export default function Compare() {
             <NumField label="Epochs" keyName="epochs" obj={cParams} setFn={setC} />
             <NumField label="LR" keyName="lr" obj={cParams} setFn={setC} />
             <NumField label="Batch" keyName="batch_size" obj={cParams} setFn={setC} />
+            <TextField label="Resume from" keyName="resume_from" obj={cParams} setFn={setC} placeholder="auto | checkpoint id" />
+          </>)}
+          {(classical === 'sgd_logreg' || classical === 'sgd_rbf' || classical === 'mlp_stream') && (<>
+            <NumField label="Epochs" keyName="epochs" obj={cParams} setFn={setC} />
+            <NumField label="Chunk rows" keyName="chunk_rows" obj={cParams} setFn={setC} />
+          </>)}
+          {(classical === 'sgd_logreg' || classical === 'sgd_rbf') && (
+            <NumField label="Alpha" keyName="alpha" obj={cParams} setFn={setC} />
+          )}
+          {classical === 'sgd_rbf' && (<>
+            <NumField label="Features" keyName="n_components" obj={cParams} setFn={setC} />
+            <TextField label="Gamma" keyName="gamma" obj={cParams} setFn={setC} placeholder="scale | number" />
+          </>)}
+          {classical === 'mlp_stream' && (<>
+            <NumField label="Hidden" keyName="hidden" obj={cParams} setFn={setC} />
+            <NumField label="LR" keyName="lr" obj={cParams} setFn={setC} />
+            <NumField label="Batch" keyName="batch_size" obj={cParams} setFn={setC} />
           </>)}
         </div>
       </div>
@@ -271,10 +311,16 @@ export default function Compare() {
             <NumField label="Epochs" keyName="epochs" obj={qParams} setFn={setQ} />
             <NumField label="LR" keyName="lr" obj={qParams} setFn={setQ} />
             <NumField label="Qubits" keyName="n_qubits" obj={qParams} setFn={setQ} />
+            <TextField label="Reducer" keyName="reducer" obj={qParams} setFn={setQ} placeholder="random | pca | slice" />
+            <TextField label="Noise model" keyName="noise_model" obj={qParams} setFn={setQ} placeholder="mixed | trajectory" />
+            <NumField label="Trajectories" keyName="trajectories" obj={qParams} setFn={setQ} />
+            <TextField label="Resume from" keyName="resume_from" obj={qParams} setFn={setQ} placeholder="auto | checkpoint id" />
           </>)}
           {quantum === 'qnn_simple' && (<>
             <NumField label="Epochs" keyName="epochs" obj={qParams} setFn={setQ} />
             <NumField label="LR" keyName="lr" obj={qParams} setFn={setQ} />
+            <TextField label="Reducer" keyName="reducer" obj={qParams} setFn={setQ} placeholder="slice | pca | random" />
+            <TextField label="Resume from" keyName="resume_from" obj={qParams} setFn={setQ} placeholder="auto | checkpoint id" />
           </>)}
           {quantum === 'hybrid_torch' && (<>
             <NumField label="Qubits" keyName="n_qubits" obj={qParams} setFn={setQ} />
@@ -282,6 +328,7 @@ export default function Compare() {
             <NumField label="Epochs" keyName="epochs" obj={qParams} setFn={setQ} />
             <NumField label="LR" keyName="lr" obj={qParams} setFn={setQ} />
             <NumField label="Batch" keyName="batch_size" obj={qParams} setFn={setQ} />
+            <TextField label="Resume from" keyName="resume_from" obj={qParams} setFn={setQ} placeholder="auto | checkpoint id" />
           </>)}
           {quantum === 'aec_qnn' && (<>
             <NumField label="Encoding dim" keyName="encoding_dim" obj={qParams} setFn={setQ} />
@@ -293,6 +340,13 @@ export default function Compare() {
             <NumField label="Layers" keyName="layers" obj={qParams} setFn={setQ} />
             <NumField label="Noise p" keyName="noise_prob" obj={qParams} setFn={setQ} />
             <NumField label="Shots" keyName="shots" obj={qParams} setFn={setQ} />
+            <TextField label="Reducer" keyName="reducer" obj={qParams} setFn={setQ} placeholder="autoencoder | pca | random" />
+          </>)}
+          {quantum === 'qsvm_kernel' && (<>
+            <NumField label="Qubits" keyName="n_qubits" obj={qParams} setFn={setQ} />
+            <NumField label="Layers" keyName="layers" obj={qParams} setFn={setQ} />
+            <NumField label="C" keyName="C" obj={qParams} setFn={setQ} />
+            <TextField label="Reducer" keyName="reducer" obj={qParams} setFn={setQ} placeholder="random | pca | slice" />
           </>)}
         </div>
       </div>
@@ -387,9 +441,11 @@ export default function Compare() {
                     <div className="flex flex-wrap items-center gap-2 mt-1">
                       <span className="inline-flex items-center rounded-full bg-slate-100 px-2.5 py-1 text-xs font-medium text-slate-700">
                         Classical: {CLASSICAL_MODELS[qc.recommendation.classical].name}
+                        {qc.estimate?.classical && <> · ~{fmtSeconds(qc.estimate.classical.total_s)}</>}
                       </span>
                       <span className="inline-flex items-center rounded-full bg-slate-100 px-2.5 py-1 text-xs font-medium text-slate-700">
                         Quantum: {QUANTUM_MODELS[qc.recommendation.quantum].name}
+                        {qc.estimate?.quantum && <> · ~{fmtSeconds(qc.estimate.quantum.total_s)}</>}
                       </span>
                       <button
                         type="button"